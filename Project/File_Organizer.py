@@ -1,5 +1,14 @@
 import os
+import re
+import time
 import shutil
+import fnmatch
+import argparse
+import tempfile
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from file_dedup import find_duplicates, link_duplicates, report_duplicates
+from file_magic import MagicCache, CACHE_FILE
 
 # أنواع الملفات
 FILE_TYPES = {
@@ -11,21 +20,246 @@ FILE_TYPES = {
     "Scripts": [".py", ".sh", ".bat"]
 }
 
-def organize_folder(folder_path):
-    for file in os.listdir(folder_path):
-        file_path = os.path.join(folder_path, file)
-        
-        if os.path.isfile(file_path):
-            _, ext = os.path.splitext(file)
-            for category, extensions in FILE_TYPES.items():
-                if ext.lower() in extensions:
-                    target_folder = os.path.join(folder_path, category)
-                    os.makedirs(target_folder, exist_ok=True)
-                    shutil.move(file_path, os.path.join(target_folder, file))
-                    print(f"Moved {file} → {category}")
-                    break
+# ".jpg" -> "Images", built once so each file is a single dict lookup
+EXTENSION_CATEGORY = {ext: category for category, extensions in FILE_TYPES.items() for ext in extensions}
+
+# Moves are handed to the worker threads in batches of this size,
+# so 500k files means 500 tasks instead of 500k futures
+BATCH_SIZE = 1000
+WORKERS = 8
+
+
+def category_for(name):
+    _, ext = os.path.splitext(name)
+    return EXTENSION_CATEGORY.get(ext.lower())
+
+
+def compile_globs(patterns):
+    """One regex for a list of globs like "*.tmp" or "old/*", or None if there are none."""
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+def _matches(globs, name, relative):
+    # "*.tmp" is meant for the name, "photos/*" for the path inside the folder
+    return globs.match(name) is not None or globs.match(relative) is not None
+
+
+# ====== Planner ======
+def walk_files(folder_path, max_depth=0, include=None, exclude=None):
+    """
+    Yield (DirEntry, path relative to folder_path) for the files to organize.
+
+    max_depth 0 looks at the top level only, None goes all the way down.
+    Directories are read one at a time with os.scandir, depth first, and
+    only the ones still to visit are kept, so memory depends on the shape
+    of the tree, not on how many files it has. Category folders at the top are skipped,
+    they hold files that are already organized. Excluded directories are
+    not entered at all; symlinked directories are not followed.
+    """
+    pending = [(folder_path, "", 0)]
+    while pending:
+        directory, prefix, depth = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                relative = prefix + entry.name
+                if exclude is not None and _matches(exclude, entry.name, relative):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if max_depth is not None and depth >= max_depth:
+                        continue
+                    if depth == 0 and entry.name in FILE_TYPES:
+                        continue
+                    pending.append((entry.path, relative + "/", depth + 1))
+                elif entry.is_file():
+                    if include is None or _matches(include, entry.name, relative):
+                        yield entry, relative
+
+
+def plan_moves(folder_path, max_depth=0, include=None, exclude=None, sniffer=None):
+    """
+    Yield the moves to make as (source, target) pairs, as the folder is scanned.
+
+    os.scandir gets the file type together with the name, so there is no
+    extra isfile() stat per file. Files from subfolders keep their folder
+    inside the category, "trip/a.jpg" goes to "Images/trip/a.jpg", so equal
+    names in different folders don't overwrite each other.
+    With a MagicCache as `sniffer`, the first bytes of each file decide the
+    category. The extension is used when they are not recognised, or when
+    they only show a container (a zip) and the extension has a category.
+    """
+    for entry, relative in walk_files(folder_path, max_depth, include, exclude):
+        if relative == CACHE_FILE:
+            continue
+        category = category_for(entry.name)
+        if sniffer is not None:
+            sniffed = sniffer.classify(entry)
+            if sniffed is not None and not (sniffed[1] and category):
+                category = sniffed[0]
+        if category:
+            yield entry.path, os.path.join(folder_path, category, relative)
+
+
+# ====== Executor ======
+def _move_batch(moves):
+    """Move one batch, return the (source, error) pairs that failed."""
+    failed = []
+    for source, target in moves:
+        try:
+            # The target is inside the same folder, so a plain rename almost always works
+            os.rename(source, target)
+        except OSError:
+            try:
+                shutil.move(source, target)
+            except OSError as error:
+                failed.append((source, error))
+    return failed
+
+
+def _batches(moves):
+    batch = []
+    for move in moves:
+        batch.append(move)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def execute_plan(moves, workers=WORKERS):
+    """
+    Move files on a thread pool while the plan is still being produced.
+
+    Each target folder is created once, just before the first batch that
+    needs it. At most two batches per worker wait in the queue, so a huge
+    tree never sits in memory as one big list of moves.
+    """
+    created = set()
+    in_flight = deque()
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch in _batches(moves):
+            for folder in {os.path.dirname(target) for _, target in batch} - created:
+                os.makedirs(folder, exist_ok=True)
+                created.add(folder)
+            in_flight.append(pool.submit(_move_batch, batch))
+            if len(in_flight) >= workers * 2:
+                failed.extend(in_flight.popleft().result())
+        while in_flight:
+            failed.extend(in_flight.popleft().result())
+    return failed
+
+
+def handle_duplicates(folder_path, mode, dry_run, max_depth, include, exclude):
+    """
+    Find files with the same content and deal with them before organizing:
+    "report" lists them, "link" turns the copies into hard links to the
+    first one, "skip" leaves the copies where they are. Returns the paths
+    that should not be moved.
+    """
+    start = time.perf_counter()
+    groups = find_duplicates(entry for entry, _ in walk_files(folder_path, max_depth, include, exclude))
+    print(f"Duplicate check took {time.perf_counter() - start:.2f}s")
+    report_duplicates(groups)
+    if mode == "link" and not dry_run:
+        failed = link_duplicates(groups)
+        for path, error in failed[:20]:
+            print(f"Could not link {path}: {error}")
+        print(f"Replaced {sum(len(paths) - 1 for paths in groups) - len(failed):,} copies with hard links")
+    if mode == "skip":
+        return {path for _, *copies in groups for path in copies}
+    return set()
+
+
+def organize_folder(folder_path, dry_run=False, workers=WORKERS, max_depth=0, include=(), exclude=(),
+                    duplicates=None, sniff=False):
+    """Plan and (unless dry_run) run the moves, then print what happened and how long it took."""
+    include, exclude = compile_globs(include), compile_globs(exclude)
+    skipped = set()
+    if duplicates:
+        skipped = handle_duplicates(folder_path, duplicates, dry_run, max_depth, include, exclude)
+    start = time.perf_counter()
+    counts = Counter()
+    shown = []
+    # Targets are folder_path/<category>/..., the category starts right after this
+    skip = len(os.path.join(folder_path, ""))
+
+    def counted(moves):
+        for source, target in moves:
+            if source in skipped:
+                continue
+            counts[target[skip:].split(os.sep, 1)[0]] += 1
+            if len(shown) < 20:
+                shown.append((source, target))
+            yield source, target
+
+    sniffer = MagicCache(folder_path) if sniff else None
+    moves = counted(plan_moves(folder_path, max_depth, include, exclude, sniffer))
+    if dry_run:
+        for _ in moves:
+            pass
+        failed = []
+    else:
+        failed = execute_plan(moves, workers)
+    elapsed = time.perf_counter() - start
+    if sniffer is not None:
+        # A dry run leaves the folder alone, the cache file included
+        if not dry_run:
+            sniffer.save()
+        print(f"Checked file contents: {sniffer.reads:,} read, {sniffer.hits:,} remembered from last time")
+    for category, count in sorted(counts.items()):
+        print(f"{category:10} {count:,} files")
+    total = sum(counts.values())
+    if dry_run:
+        for source, target in shown:
+            print(f"  {os.path.relpath(source, folder_path)} → {os.path.relpath(target, folder_path)}")
+        if total > len(shown):
+            print(f"  ... and {total - len(shown):,} more")
+        print(f"Planned {total:,} moves in {elapsed:.2f}s (dry run, nothing moved)")
+        return total, []
+    for source, error in failed[:20]:
+        print(f"Could not move {source}: {error}")
+    print(f"Moved {total - len(failed):,} files, {len(failed):,} failed in {elapsed:.2f}s"
+          f"{f', left {len(skipped):,} duplicates in place' if skipped else ''}")
+    return total, failed
+
+
+# ====== Benchmark ======
+def benchmark(count=100_000, workers=WORKERS):
+    """Organize a temporary folder of `count` empty files."""
+    folder = tempfile.mkdtemp(prefix="organizer_")
+    extensions = [ext for extensions in FILE_TYPES.values() for ext in extensions] + [".unknown"]
+    for i in range(count):
+        open(os.path.join(folder, f"file{i}{extensions[i % len(extensions)]}"), "w").close()
+    organize_folder(folder, workers=workers)
+    shutil.rmtree(folder)
+
 
 if __name__ == "__main__":
-    path = os.getcwd ()
-    organize_folder(path)
-    print("!The files are organized smoothly.")
+    parser = argparse.ArgumentParser(description="Sort the files in a folder into category folders.")
+    parser.add_argument("folder", nargs="?", default=os.getcwd(), help="folder to organize (default: here)")
+    parser.add_argument("--dry-run", action="store_true", help="only show the plan, move nothing")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="threads moving files")
+    parser.add_argument("-r", "--recursive", action="store_true", help="also organize files in subfolders")
+    parser.add_argument("--max-depth", type=int, help="how many folder levels down to go (implies -r)")
+    parser.add_argument("--include", action="append", default=[], metavar="GLOB",
+                        help="only organize matching files, e.g. '*.jpg' (repeatable)")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="skip matching files and folders, e.g. 'node_modules' (repeatable)")
+    parser.add_argument("--duplicates", choices=("report", "skip", "link"),
+                        help="find files with the same content first, then list them, leave the copies "
+                             "in place, or replace the copies with hard links")
+    parser.add_argument("--sniff", action="store_true",
+                        help="sort by file content (magic bytes) instead of trusting the extension")
+    parser.add_argument("--bench", type=int, metavar="N", help="time organizing N temporary files instead")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark(args.bench, args.workers)
+    else:
+        max_depth = args.max_depth if args.max_depth is not None else (None if args.recursive else 0)
+        organize_folder(args.folder, args.dry_run, args.workers, max_depth, args.include, args.exclude,
+                        args.duplicates, args.sniff)
+        if not args.dry_run:
+            print("!The files are organized smoothly.")
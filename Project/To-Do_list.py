@@ -11,7 +11,20 @@ class TerminalColors:
     BLACK='\033[30m'
     WHITE = '\033[37m'
 import os
-Taskes = []
+import sys
+# The task engine is shared with Python/to-do-list.py, add its folder to the module search path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Python"))
+from task_store import TaskStore
+
+Taskes = TaskStore("tasks.json")
+
+
+def show_tasks(tasks):
+    for task in tasks:
+        color = TerminalColors.GREEN if task["Complete"] else TerminalColors.RESET
+        print(f"{color}{task['id']}. {task['Task']}{TerminalColors.RESET}")
+
+
 print(f"{TerminalColors.HEADER}======= welcome to the To-Do List App!======{TerminalColors.RESET}")
 
 while True:
@@ -22,21 +35,36 @@ Choose an option:{TerminalColors.UNDERLINE}
 1. Add Task
 2. View Tasks
 3. Delete Task
-4. Exit{TerminalColors.RESET}""")
-        choice = int(input("Enter Your Choice (1-4): "))
+4. Search Tasks
+5. Exit{TerminalColors.RESET}""")
+        choice = int(input("Enter Your Choice (1-5): "))
         if choice == 1 :
             task_add =  input("Enter the task: ")
-            Taskes.append(task_add)
+            Taskes.add(task_add)
             print("Task Added!\n")
             continue
         elif choice ==2 :
-            for i in Taskes :
-                print (i)
+            if not Taskes :
+                print("No tasks yet.")
+            show_tasks(Taskes)
             continue
         elif choice == 3 :
-            break
+            show_tasks(Taskes)
+            task_id = int(input("Enter the number of the task to delete: "))
+            if Taskes.delete(task_id) :
+                print("Task Deleted!\n")
+            else:
+                print(f"{TerminalColors.RED}No task with that number.{TerminalColors.RESET}")
+            continue
+        elif choice == 4 :
+            found = Taskes.search(input("Search for: "))
+            if not found :
+                print("No matching tasks.")
+            show_tasks(found)
+            continue
         else:
             print("Goodbye!")
+            Taskes.close()
             break
     except ValueError:
         print("Please Enter the Number.")
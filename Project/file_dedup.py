@@ -0,0 +1,151 @@
+import os
+import sys
+import mmap
+import time
+import random
+import shutil
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# Files are first compared on this many leading bytes, most different files differ early
+PARTIAL_SIZE = 64 * 1024
+WORKERS = os.cpu_count() or 4
+
+
+def hash_file(job):
+    """
+    (path, limit) -> (path, hex digest of the first `limit` bytes, or all if None).
+
+    The file is memory-mapped and handed to the hash as is, so big files
+    are never copied into Python bytes. Unreadable files give None.
+    """
+    path, limit = job
+    digest = hashlib.blake2b()
+    try:
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    digest.update(view[:limit] if limit else view)
+    except (OSError, ValueError):
+        return path, None
+    return path, digest.hexdigest()
+
+
+def _regroup(pool, groups, limit):
+    """Split each (size, paths) group by hash, keep the parts that still have 2+ files."""
+    jobs = [(path, limit) for _, paths in groups for path in paths]
+    sizes = [size for size, paths in groups for _ in paths]
+    chunksize = max(1, len(jobs) // (WORKERS * 4))
+    by_hash = {}
+    for size, (path, digest) in zip(sizes, pool.map(hash_file, jobs, chunksize=chunksize)):
+        if digest is not None:
+            by_hash.setdefault((size, digest), []).append(path)
+    return [(size, paths) for (size, _), paths in by_hash.items() if len(paths) > 1]
+
+
+def find_duplicates(entries, workers=WORKERS):
+    """
+    Groups of files with identical content, from an iterable of os.DirEntry.
+
+    1. Group by size; a file with a unique size has no duplicate and is never read.
+    2. Hash the first PARTIAL_SIZE bytes of the rest, on a process pool.
+    3. Hash the whole file only where sizes and first bytes all agree.
+
+    Hard links to the same file count as one file (where the file system
+    gives inode numbers), and empty files are ignored.
+    Each group is sorted so the shortest path comes first: that copy is kept.
+    """
+    by_size = {}
+    seen = set()
+    for entry in entries:
+        info = entry.stat(follow_symlinks=False)
+        if not info.st_size:
+            continue
+        if not info.st_ino:
+            # On Windows DirEntry.stat() leaves st_dev and st_ino at 0, a full stat fills them in
+            info = os.stat(entry.path, follow_symlinks=False)
+        file_id = (info.st_dev, info.st_ino)
+        if info.st_ino:
+            if file_id in seen:
+                continue
+            seen.add(file_id)
+        by_size.setdefault(info.st_size, []).append(entry.path)
+    candidates = [(size, paths) for size, paths in by_size.items() if len(paths) > 1]
+    if not candidates:
+        return []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        groups = _regroup(pool, candidates, PARTIAL_SIZE)
+        # Up to PARTIAL_SIZE bytes the partial hash already covered the whole file
+        small = [group for group in groups if group[0] <= PARTIAL_SIZE]
+        large = [group for group in groups if group[0] > PARTIAL_SIZE]
+        groups = small + _regroup(pool, large, None)
+    return [sorted(paths, key=lambda path: (len(path), path)) for _, paths in groups]
+
+
+def link_duplicates(groups):
+    """Replace every copy but the first in each group by a hard link to it, return the failures."""
+    failed = []
+    for keep, *copies in groups:
+        for copy in copies:
+            temp = copy + ".dedup-tmp"
+            linked = False
+            try:
+                os.link(keep, temp)
+                linked = True
+                # The rename swaps the copy for the link in one step
+                os.replace(temp, copy)
+            except OSError as error:
+                # Only clean up our own link, a file already named like temp is not ours
+                if linked:
+                    os.remove(temp)
+                failed.append((copy, error))
+    return failed
+
+
+def report_duplicates(groups, limit=20):
+    wasted = sum(os.path.getsize(paths[0]) * (len(paths) - 1) for paths in groups)
+    copies = sum(len(paths) - 1 for paths in groups)
+    for keep, *others in groups[:limit]:
+        print(f"{keep}")
+        for other in others:
+            print(f"  = {other}")
+    if len(groups) > limit:
+        print(f"... and {len(groups) - limit:,} more groups")
+    print(f"{copies:,} duplicate files in {len(groups):,} groups, {wasted / 1024 / 1024:.1f} MiB wasted")
+
+
+# ====== Benchmark ======
+def benchmark(count=20_000):
+    """Find duplicates among `count` files, compared with fully hashing every file."""
+    folder = tempfile.mkdtemp(prefix="dedup_")
+    rng = random.Random(13)
+    originals = []
+    for i in range(count):
+        path = os.path.join(folder, f"file{i}.bin")
+        if originals and rng.random() < 0.05:
+            shutil.copyfile(rng.choice(originals), path)
+            continue
+        # Mostly small files, some large ones sharing a size and first 64 KiB
+        if rng.random() < 0.02:
+            data = b"\0" * PARTIAL_SIZE + os.urandom(rng.randint(1, 4)) * 100_000
+        else:
+            data = os.urandom(rng.randint(1, 200_000))
+        with open(path, "wb") as file:
+            file.write(data)
+        originals.append(path)
+
+    start = time.perf_counter()
+    with os.scandir(folder) as entries:
+        groups = find_duplicates(list(entries))
+    print(f"Found {sum(len(paths) - 1 for paths in groups):,} duplicates of {count:,} files "
+          f"in {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    with ProcessPoolExecutor() as pool:
+        list(pool.map(hash_file, [(os.path.join(folder, name), None) for name in os.listdir(folder)], chunksize=64))
+    print(f"Hashing every file in full took {time.perf_counter() - start:.2f}s")
+    shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:2]))
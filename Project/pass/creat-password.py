@@ -1,12 +1,13 @@
-import random
-import string
-import json
 import hashlib
 import os
 from datetime import datetime
 from getpass import getpass
 from cryptography.fernet import Fernet
 import base64
+from vault_log import VaultLog
+from password_gen import generate_password
+from password_strength import check_password, open_breach_list
+import sys
 
 # ====== Colors ======
 RED = "\033[91m"
@@ -51,6 +52,14 @@ def setup_master_password():
             pwd1 = getpass("Enter new master password: ")
             pwd2 = getpass("Confirm master password: ")
             if pwd1 == pwd2 and pwd1.strip() != "":
+                breach_list = open_breach_list()
+                strength = check_password(pwd1, breach_list)
+                if breach_list is not None:
+                    breach_list.close()
+                if strength["breached"]:
+                    print(f"{RED}This password appears in a breached-password list. Choose another one.{RESET}")
+                    continue
+                print(f"{BLUE}Strength: {RESET}{strength['label']} ({strength['entropy']} bits)")
                 with open(MASTER_FILE, "w") as file:
                     file.write(hash_password(pwd1))
                 print(f"{GREEN}Master password set successfully!{RESET}")
@@ -73,28 +82,36 @@ def verify_master_password():
     print(f"{RED}Too many failed attempts. Exiting...{RESET}")
     exit()
 
+def open_vault(password):
+    """Used by the vault server to unlock again after an idle lock."""
+    with open(MASTER_FILE, "r") as file:
+        saved_hash = file.read().strip()
+    if hash_password(password) != saved_hash:
+        return None
+    return VaultLog(PASSWORD_FILE, derive_key(password))
+
+def unlock_vault():
+    """Ask for the master password, return (vault, data) with the vault loaded."""
+    vault = VaultLog(PASSWORD_FILE, derive_key(verify_master_password()))
+    return vault, load_data(vault)
+
 # ====== Password Manager Functions ======
-def load_data(key):
-    if not os.path.exists(PASSWORD_FILE):
-        return []
-    with open(PASSWORD_FILE, "rb") as file:
-        encrypted = file.read()
+def load_data(vault):
+    """Load the vault file and replay the change log on top of it."""
     try:
-        decrypted = decrypt_data(encrypted, key)
-        return json.loads(decrypted)
+        return vault.load()
     except:
         print(f"{RED}Failed to decrypt data. Wrong password or corrupted file.{RESET}")
         exit()
 
-def save_data(data, key):
-    json_data = json.dumps(data, indent=4)
-    encrypted = encrypt_data(json_data, key)
-    with open(PASSWORD_FILE, "wb") as file:
-        file.write(encrypted)
+def save_data(data, vault, entry):
+    """Append the new entry to the change log (cheap), the vault file is compacted later."""
+    vault.append({"op": "add", "entry": entry})
+    vault.maybe_compact(data)
 
 def generate_strong_password(length=20):
-    characters = string.ascii_letters + string.digits + string.punctuation
-    return ''.join(random.choice(characters) for _ in range(length))
+    """Cryptographically secure, with at least one lower, upper, digit and symbol."""
+    return generate_password(length)
 
 def add_password(data):
     account_name = input(f"{YELLOW}Enter program / website / account name: {RESET}")
@@ -108,7 +125,9 @@ def add_password(data):
     print(f"\n{GREEN}{BOLD}Password generated and saved successfully!{RESET}")
     print(f"{BLUE}Account: {RESET}{account_name}")
     print(f"{BLUE}Password: {RESET}{strong_password}")
+    print(f"{BLUE}Strength: {RESET}{check_password(strong_password)['label']}")
     print(f"{BLUE}Date: {RESET}{entry['time']}\n")
+    return entry
 
 def view_all_passwords(data):
     if not data:
@@ -135,9 +154,14 @@ def search_password(data):
 
 # ====== Main ======
 if __name__ == "__main__":
-    master_pwd = verify_master_password()
-    key = derive_key(master_pwd)
-    data = load_data(key)
+    # python creat-password.py --serve  → keep the vault unlocked for other tools
+    if "--serve" in sys.argv:
+        from vault_server import serve
+        # The server unlocks by itself, so nothing here holds on to the vault
+        serve(unlock_vault, open_vault)
+        sys.exit()
+
+    vault, data = unlock_vault()
 
     while True:
         print(f"""{BOLD}{BLUE}
@@ -150,14 +174,14 @@ if __name__ == "__main__":
         choice = input(f"{YELLOW}Choose an option (1-4): {RESET}")
         
         if choice == "1":
-            add_password(data)
-            save_data(data, key)
+            entry = add_password(data)
+            save_data(data, vault, entry)
         elif choice == "2":
             view_all_passwords(data)
         elif choice == "3":
             search_password(data)
         elif choice == "4":
-            save_data(data, key)
+            vault.close(data)
             print(f"{GREEN}Goodbye!{RESET}")
             break
         else:
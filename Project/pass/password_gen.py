@@ -0,0 +1,94 @@
+import os
+import re
+import sys
+import time
+import string
+
+# ====== Character Classes ======
+LOWER = string.ascii_lowercase
+UPPER = string.ascii_uppercase
+DIGITS = string.digits
+SYMBOLS = string.punctuation
+ALPHABET = LOWER + UPPER + DIGITS + SYMBOLS
+
+# How many random bytes we pull from the OS at once
+BATCH_BYTES = 1 << 16
+
+
+def _byte_table(alphabet):
+    """
+    Build the translate() table that turns random bytes into characters.
+
+    Only bytes below the largest multiple of len(alphabet) are kept, so every
+    character has exactly the same chance (rejection sampling, no modulo bias).
+    """
+    size = len(alphabet)
+    if not 0 < size <= 256 or max(map(ord, alphabet)) > 255:
+        raise ValueError("alphabet must have between 1 and 256 single-byte characters")
+    limit = 256 // size * size
+    table = bytes(ord(alphabet[b % size]) if b < limit else 0 for b in range(256))
+    return table, bytes(range(limit, 256))
+
+
+def _policy_regex(alphabet, min_lower, min_upper, min_digits, min_symbols):
+    """One regex that checks all per-class minimums at once."""
+    checks = []
+    for chars, minimum in ((LOWER, min_lower), (UPPER, min_upper), (DIGITS, min_digits), (SYMBOLS, min_symbols)):
+        if minimum <= 0:
+            continue
+        wanted = "".join(c for c in chars if c in alphabet)
+        if not wanted:
+            raise ValueError(f"alphabet has no characters for a class with minimum {minimum}")
+        cls = re.escape(wanted)
+        checks.append(f"(?=(?:[^{cls}]*[{cls}]){{{minimum}}})")
+    return re.compile("".join(checks))
+
+
+def generate_passwords(count, length=20, min_lower=1, min_upper=1, min_digits=1, min_symbols=1, alphabet=ALPHABET):
+    """
+    Yield `count` random passwords that follow the policy.
+
+    Bytes come from os.urandom (the same source as the secrets module).
+    Passwords that miss a minimum are thrown away and drawn again, which
+    keeps every valid password equally likely.
+    """
+    if min(min_lower, min_upper, min_digits, min_symbols) < 0:
+        raise ValueError("minimums can't be negative")
+    if min_lower + min_upper + min_digits + min_symbols > length:
+        raise ValueError("the class minimums add up to more than the password length")
+    table, rejected = _byte_table(alphabet)
+    policy = _policy_regex(alphabet, min_lower, min_upper, min_digits, min_symbols)
+    # Small requests don't need a full batch of random bytes
+    batch = min(BATCH_BYTES, count * length * 2 + 64)
+    made = 0
+    leftover = ""
+    while made < count:
+        chars = leftover + os.urandom(batch).translate(table, rejected).decode("latin-1")
+        usable = len(chars) - len(chars) % length
+        leftover = chars[usable:]
+        for start in range(0, usable, length):
+            password = chars[start:start + length]
+            if policy.match(password):
+                yield password
+                made += 1
+                if made == count:
+                    return
+
+
+def generate_password(length=20, min_lower=1, min_upper=1, min_digits=1, min_symbols=1, alphabet=ALPHABET):
+    """Return one random password that follows the policy."""
+    return next(generate_passwords(1, length, min_lower, min_upper, min_digits, min_symbols, alphabet))
+
+
+# ====== Benchmark ======
+def benchmark(count=1_000_000, length=20):
+    """Generate `count` passwords and print how fast it went."""
+    start = time.perf_counter()
+    made = sum(1 for _ in generate_passwords(count, length))
+    elapsed = time.perf_counter() - start
+    print(f"{made:,} passwords of length {length} in {elapsed:.2f}s ({made / elapsed:,.0f} per second)")
+
+
+if __name__ == "__main__":
+    # python password_gen.py [count] [length]
+    benchmark(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,213 @@
+import os
+import sys
+import math
+import mmap
+import heapq
+import hashlib
+import tempfile
+from getpass import getpass
+
+# ====== Settings ======
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BREACH_FILE = os.path.join(BASE_DIR, "breached.bin")
+
+# Each breached password is stored as the first 8 bytes of its SHA-1.
+# 100M entries is 800 MB on disk and collisions stay around 1 in 10^11.
+KEY_SIZE = 8
+
+# How many keys we sort in memory at once while building the file
+RUN_SIZE = 5_000_000
+
+LEET = str.maketrans("@4310$5!7", "aaeiossit")
+# Stored de-leeted like the password they are compared with, so "trustno1" still matches
+COMMON_WORDS = {word.translate(LEET) for word in (
+    "password", "passw0rd", "qwerty", "letmein", "welcome", "admin", "login",
+    "monkey", "dragon", "football", "baseball", "iloveyou", "master", "sunshine",
+    "princess", "shadow", "superman", "trustno1", "secret", "abc123", "123456",
+)}
+KEYBOARD_ROWS = ["qwertyuiop", "asdfghjkl", "zxcvbnm", "1234567890"]
+LABELS = ["Very weak", "Weak", "Fair", "Strong", "Very strong"]
+
+
+# ====== Strength Estimate ======
+def _pool_size(password):
+    pool = 0
+    if any(c.islower() for c in password):
+        pool += 26
+    if any(c.isupper() for c in password):
+        pool += 26
+    if any(c.isdigit() for c in password):
+        pool += 10
+    if any(not c.isalnum() for c in password):
+        pool += 33
+    return pool
+
+
+def _is_predictable(prev, char):
+    """Repeats, a-b-c / 3-2-1 steps and keyboard neighbours add almost nothing."""
+    if char == prev or abs(ord(char) - ord(prev)) == 1:
+        return True
+    pair = (prev + char).lower()
+    return any(pair in row or pair[::-1] in row for row in KEYBOARD_ROWS)
+
+
+def estimate_entropy(password):
+    """Rough guessing entropy in bits, a lighter take on the zxcvbn idea."""
+    if not password:
+        return 0.0
+    bits_per_char = math.log2(_pool_size(password))
+    plain = password.lower().translate(LEET)
+    # Dictionary words cost the attacker one guess out of the list, not one per letter
+    covered = [False] * len(password)
+    bits = 0.0
+    for word in COMMON_WORDS:
+        start = plain.find(word)
+        if start != -1 and not any(covered[start:start + len(word)]):
+            covered[start:start + len(word)] = [True] * len(word)
+            bits += math.log2(len(COMMON_WORDS)) + 1
+    prev = None
+    for index, char in enumerate(password):
+        if not covered[index]:
+            bits += 1.0 if prev is not None and _is_predictable(prev, char) else bits_per_char
+        prev = char
+    return bits
+
+
+def strength_score(bits):
+    """Map entropy bits to a 0-4 score like zxcvbn."""
+    for score, limit in enumerate((28, 36, 60, 80)):
+        if bits < limit:
+            return score
+    return 4
+
+
+def check_password(password, breach_list=None):
+    """Return {"entropy", "score", "label", "breached"} for one password."""
+    bits = estimate_entropy(password)
+    breached = breach_list is not None and password in breach_list
+    score = 0 if breached else strength_score(bits)
+    return {"entropy": round(bits, 1), "score": score, "label": LABELS[score], "breached": breached}
+
+
+# ====== Breach List ======
+def password_key(password):
+    return hashlib.sha1(password.encode("utf-8")).digest()[:KEY_SIZE]
+
+
+def _line_key(line):
+    """Accept plain passwords or HIBP style "SHA1HEX:count" lines."""
+    text = line.rstrip("\r\n")
+    head = text.split(":", 1)[0]
+    if len(head) == 40:
+        try:
+            return bytes.fromhex(head)[:KEY_SIZE]
+        except ValueError:
+            pass
+    return password_key(text)
+
+
+def _write_run(keys, folder):
+    keys.sort()
+    run = tempfile.NamedTemporaryFile(dir=folder, delete=False, suffix=".run")
+    with run:
+        run.write(b"".join(keys))
+    return run.name
+
+
+def _read_run(path):
+    with open(path, "rb") as file:
+        while True:
+            key = file.read(KEY_SIZE)
+            if not key:
+                return
+            yield key
+
+
+def build_breach_file(source_path, out_path=BREACH_FILE):
+    """
+    Turn a big text list into a sorted file of fixed-size hash keys.
+
+    The list is sorted in runs of RUN_SIZE keys and the runs are merged,
+    so memory stays bounded no matter how long the list is.
+    """
+    folder = os.path.dirname(os.path.abspath(out_path))
+    runs = []
+    keys = []
+    with open(source_path, "r", encoding="utf-8", errors="ignore") as source:
+        for line in source:
+            keys.append(_line_key(line))
+            if len(keys) >= RUN_SIZE:
+                runs.append(_write_run(keys, folder))
+                keys = []
+    if keys:
+        runs.append(_write_run(keys, folder))
+    count = 0
+    last = None
+    tmp_path = out_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as out:
+            for key in heapq.merge(*(_read_run(path) for path in runs)):
+                if key != last:
+                    out.write(key)
+                    count += 1
+                    last = key
+        os.replace(tmp_path, out_path)
+    finally:
+        for path in runs:
+            os.remove(path)
+    return count
+
+
+class BreachList:
+    """Memory-mapped sorted key file, looked up with a binary search."""
+
+    def __init__(self, path=BREACH_FILE):
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        self.count = size // KEY_SIZE
+        # mmap can't map an empty file
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __contains__(self, password):
+        key = password_key(password)
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            found = self.map[mid * KEY_SIZE:(mid + 1) * KEY_SIZE]
+            if found < key:
+                low = mid + 1
+            elif found > key:
+                high = mid
+            else:
+                return True
+        return False
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        # A file shorter than one key is still mapped, so check the map itself
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        self.file.close()
+
+
+def open_breach_list(path=BREACH_FILE):
+    """Return a BreachList, or None when no list has been built yet."""
+    return BreachList(path) if os.path.exists(path) else None
+
+
+if __name__ == "__main__":
+    # python password_strength.py build <passwords.txt> [breached.bin]
+    # python password_strength.py check
+    if len(sys.argv) >= 3 and sys.argv[1] == "build":
+        out_path = sys.argv[3] if len(sys.argv) > 3 else BREACH_FILE
+        print(f"Stored {build_breach_file(sys.argv[2], out_path):,} breached passwords in {out_path}")
+    elif len(sys.argv) == 2 and sys.argv[1] == "check":
+        breach_list = open_breach_list()
+        result = check_password(getpass("Password to check: "), breach_list)
+        print(f"{result['label']} ({result['entropy']} bits)")
+        if result["breached"]:
+            print("This password appears in the breached-password list!")
+    else:
+        print("Usage: python password_strength.py build <passwords.txt> [breached.bin] | check")
@@ -0,0 +1,148 @@
+import os
+import json
+import threading
+from cryptography.fernet import Fernet, InvalidToken
+
+# ====== Settings ======
+# How many logged changes we allow before folding them into the vault file
+COMPACT_EVERY = 50
+
+
+# ====== File Helpers ======
+def write_atomic(path, blob):
+    """Write bytes to a temp file next to `path`, then rename it over `path`."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(blob)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def apply_change(data, record):
+    """Apply one logged change to the list of saved passwords."""
+    if record["op"] == "add":
+        data.append(record["entry"])
+    elif record["op"] == "delete":
+        data[:] = [entry for entry in data if entry["account_name"] != record["account_name"]]
+
+
+# ====== Write-Ahead Log ======
+class VaultLog:
+    """
+    Keeps the encrypted vault safe from half-written saves.
+
+    Every change is encrypted and appended to `<vault>.wal` as one line.
+    From time to time the changes are folded into the vault file itself,
+    which is always replaced with an atomic rename, never rewritten in place.
+    """
+
+    def __init__(self, vault_path, key):
+        self.vault_path = vault_path
+        self.log_path = vault_path + ".wal"
+        self.old_log_path = vault_path + ".wal.old"
+        self.fernet = Fernet(key)
+        self.seq = 0
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.worker = None
+
+    def _read_vault(self):
+        if not os.path.exists(self.vault_path):
+            return [], 0
+        with open(self.vault_path, "rb") as file:
+            content = json.loads(self.fernet.decrypt(file.read()).decode())
+        # Old vaults are a bare list of entries with no sequence number
+        if isinstance(content, list):
+            return content, 0
+        return content["entries"], content["seq"]
+
+    def _read_log(self, path):
+        if not os.path.exists(path):
+            return
+        good_end = 0
+        torn = False
+        with open(path, "rb") as file:
+            for line in file:
+                try:
+                    record = json.loads(self.fernet.decrypt(line.strip()).decode())
+                except (InvalidToken, ValueError):
+                    # A torn last line from a crash mid-append, nothing after it is valid
+                    torn = True
+                    break
+                good_end += len(line)
+                yield record
+        if torn:
+            # Cut the torn line off so the next append starts on a clean line
+            os.truncate(path, good_end)
+
+    def load(self):
+        """Read the vault and replay every logged change not yet folded into it."""
+        data, self.seq = self._read_vault()
+        for path in (self.old_log_path, self.log_path):
+            for record in self._read_log(path):
+                if record["seq"] > self.seq:
+                    apply_change(data, record)
+                    self.seq = record["seq"]
+                    self.pending += 1
+        return data
+
+    def append(self, change, data=None):
+        """
+        Log one change, e.g. {"op": "add", "entry": {...}}.
+
+        With `data` the change is applied to it under the same lock, so a
+        compaction never snapshots a seq without the change it stands for.
+        """
+        with self.lock:
+            self.seq += 1
+            record = dict(change, seq=self.seq)
+            token = self.fernet.encrypt(json.dumps(record).encode())
+            with open(self.log_path, "ab") as file:
+                file.write(token + b"\n")
+                file.flush()
+                os.fsync(file.fileno())
+            self.pending += 1
+            if data is not None:
+                apply_change(data, record)
+
+    def maybe_compact(self, data):
+        """Start a background compaction once enough changes are logged."""
+        if self.pending >= COMPACT_EVERY:
+            self.compact(data, wait=False)
+
+    def compact(self, data, wait=True):
+        """Fold the logged changes into the vault file."""
+        with self.lock:
+            if self.worker is not None and self.worker.is_alive():
+                if not wait:
+                    return
+                self.worker.join()
+            if self.pending == 0 and not os.path.exists(self.old_log_path):
+                return
+            snapshot = list(data)
+            snapshot_seq = self.seq
+            # Start a fresh log so new changes are not mixed with the ones being folded in
+            if os.path.exists(self.log_path):
+                if os.path.exists(self.old_log_path):
+                    with open(self.log_path, "rb") as src, open(self.old_log_path, "ab") as dst:
+                        dst.write(src.read())
+                    os.remove(self.log_path)
+                else:
+                    os.replace(self.log_path, self.old_log_path)
+            self.pending = 0
+            self.worker = threading.Thread(target=self._write_snapshot, args=(snapshot, snapshot_seq))
+            self.worker.start()
+        if wait:
+            self.worker.join()
+
+    def _write_snapshot(self, snapshot, snapshot_seq):
+        content = json.dumps({"seq": snapshot_seq, "entries": snapshot}, indent=4)
+        write_atomic(self.vault_path, self.fernet.encrypt(content.encode()))
+        # The vault now holds everything the old log had
+        if os.path.exists(self.old_log_path):
+            os.remove(self.old_log_path)
+
+    def close(self, data):
+        """Fold everything into the vault and wait for it to finish."""
+        self.compact(data, wait=True)
@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+
+# ====== Settings ======
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOCKET_FILE = os.path.join(BASE_DIR, "vault.sock")
+
+# Lock the vault after this many seconds without a request
+IDLE_TIMEOUT = 300
+
+# Every saved entry must have these, as str, or loading the vault breaks later
+ENTRY_FIELDS = ("account_name", "password", "time")
+
+
+# ====== Server ======
+def _text(request, field):
+    """A string field of a request, "" if it is missing."""
+    value = request.get(field, "")
+    if not isinstance(value, str):
+        raise TypeError(f"{field} must be a string")
+    return value
+
+
+class VaultServer:
+    """
+    Keeps the unlocked vault in memory and answers requests on a Unix socket.
+
+    One JSON object per line in, one JSON object per line out:
+        {"cmd": "get", "account": "github"}
+        {"cmd": "search", "keyword": "git"}
+        {"cmd": "add", "entry": {...}}
+        {"cmd": "unlock", "password": "..."}
+    After IDLE_TIMEOUT seconds without requests the vault is folded to disk
+    and dropped from memory until someone sends "unlock" again.
+    """
+
+    def __init__(self, open_vault, socket_path=SOCKET_FILE, idle_timeout=IDLE_TIMEOUT):
+        # open_vault(password) -> VaultLog or None if the password is wrong
+        self.open_vault = open_vault
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.vault = None
+        self.data = []
+        self.by_name = {}
+        self.last_used = time.monotonic()
+        # Adds whose append is still running on a worker thread
+        self.adding = 0
+
+    def unlock(self, vault, data):
+        self.vault = vault
+        self.data = data
+        self.by_name = {}
+        for entry in data:
+            self.by_name.setdefault(entry["account_name"].lower(), []).append(entry)
+        self.last_used = time.monotonic()
+
+    def lock(self):
+        if self.vault is not None:
+            self.vault.close(self.data)
+        self.vault = None
+        # Empty the list itself, not just our name for it, in case anyone else still holds it
+        self.data.clear()
+        self.data = []
+        self.by_name = {}
+
+    async def handle_request(self, request):
+        if not isinstance(request, dict):
+            raise TypeError("a request must be a JSON object")
+        cmd = request.get("cmd")
+        if cmd == "unlock":
+            vault = self.open_vault(_text(request, "password"))
+            if vault is None:
+                return {"ok": False, "error": "wrong password"}
+            loop = asyncio.get_running_loop()
+            self.unlock(vault, await loop.run_in_executor(None, vault.load))
+            return {"ok": True}
+        if self.vault is None:
+            return {"ok": False, "error": "locked"}
+        if cmd == "get":
+            return {"ok": True, "entries": self.by_name.get(_text(request, "account").lower(), [])}
+        if cmd == "search":
+            keyword = _text(request, "keyword").lower()
+            return {"ok": True, "entries": [entry for entry in self.data if keyword in entry["account_name"].lower()]}
+        if cmd == "add":
+            entry = request.get("entry")
+            # Check before appending, once it is in the log it is there for good
+            if not isinstance(entry, dict) or not all(isinstance(entry.get(field), str) for field in ENTRY_FIELDS):
+                return {"ok": False, "error": f"entry needs string fields {', '.join(ENTRY_FIELDS)}"}
+            # The fsync happens on a worker thread so other clients are not kept waiting.
+            # The entry goes into self.data together with its seq, so a compaction
+            # started by another add meanwhile either has both or neither.
+            vault = self.vault
+            loop = asyncio.get_running_loop()
+            self.adding += 1
+            try:
+                await loop.run_in_executor(None, vault.append, {"op": "add", "entry": entry}, self.data)
+            finally:
+                self.adding -= 1
+            if self.vault is not vault:
+                # Locked or unlocked again meanwhile; the entry is in the log and
+                # comes back with the next load
+                return {"ok": True}
+            self.by_name.setdefault(entry["account_name"].lower(), []).append(entry)
+            self.vault.maybe_compact(self.data)
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown command {cmd!r}"}
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.last_used = time.monotonic()
+                try:
+                    response = await self.handle_request(json.loads(line))
+                except (ValueError, KeyError, TypeError) as error:
+                    response = {"ok": False, "error": f"bad request: {error}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def watch_idle(self):
+        while True:
+            await asyncio.sleep(1)
+            # Locking folds self.data into the vault, so wait for running adds to land in it
+            if self.vault is not None and not self.adding and time.monotonic() - self.last_used > self.idle_timeout:
+                self.lock()
+
+    async def run(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        # Only the owner may talk to the vault. The socket is created that way,
+        # a chmod afterwards would leave a moment where anyone can connect.
+        old_umask = os.umask(0o077)
+        try:
+            server = await asyncio.start_unix_server(self.handle_client, path=self.socket_path)
+        finally:
+            os.umask(old_umask)
+        watcher = asyncio.create_task(self.watch_idle())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            self.lock()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+def serve(unlock, open_vault, socket_path=SOCKET_FILE, idle_timeout=IDLE_TIMEOUT):
+    """
+    Run the daemon until Ctrl+C, starting unlocked with unlock() -> (vault, data).
+
+    Only the server keeps the vault and its entries, so the idle lock
+    really drops them from memory.
+    """
+    server = VaultServer(open_vault, socket_path, idle_timeout)
+    server.unlock(*unlock())
+    print(f"Vault server listening on {socket_path} (Ctrl+C to stop)")
+    try:
+        asyncio.run(server.run())
+    except KeyboardInterrupt:
+        print("Vault server stopped.")
+
+
+# ====== Client ======
+def request(payload, socket_path=SOCKET_FILE):
+    """Send one request to a running daemon and return its answer."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(payload).encode() + b"\n")
+        with client.makefile("rb") as reply:
+            return json.loads(reply.readline())
+
+
+if __name__ == "__main__":
+    # Usage: python vault_server.py get <account> | search <keyword> | unlock
+    if len(sys.argv) < 2 or sys.argv[1] not in ("get", "search", "unlock"):
+        print("Usage: python vault_server.py get <account> | search <keyword> | unlock")
+        sys.exit(1)
+    command = sys.argv[1]
+    if command == "unlock":
+        from getpass import getpass
+        answer = request({"cmd": "unlock", "password": getpass("Enter master password: ")})
+    elif command == "get":
+        answer = request({"cmd": "get", "account": " ".join(sys.argv[2:])})
+    else:
+        answer = request({"cmd": "search", "keyword": " ".join(sys.argv[2:])})
+    if not answer["ok"]:
+        print(answer["error"])
+        sys.exit(1)
+    for entry in answer.get("entries", []):
+        print(f"{entry['account_name']}\t{entry['password']}")
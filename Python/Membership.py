@@ -1,7 +1,14 @@
 import time
 import os
-from tabulate import tabulate
-import pandas as pd
+from datetime import date
+from term_ui import notify
+from member_registry import MemberRegistry
+from member_records import User
+from member_store import MemberStore, DB_FILE, EXCEL_FILE
+from member_import import import_members, export_members
+from member_checkins import CheckInLog
+from member_expiry import ExpiryEngine, expiry_for, DEFAULT_DAYS, MAX_DAYS
+from member_view import registry_pages, store_pages, view_pages, SORT_COLUMNS
 
 def clear():
     if os.name == "nt":
@@ -9,28 +16,17 @@ def clear():
     else:
         os.system("clear")
 
-Memberships = []
-
-class User:
-    def __init__(self, first_name, last_name, membership, status):
-        self.FirstName = first_name
-        self.LastName = last_name
-        self.Membership = membership
-        self.Status = status
-
-    def display(self):
-        print(f""" First Name: {self.FirstName}
- Last Name: {self.LastName}
- Membership ID: {self.Membership}
- Membership Status: {self.Status}
-_________________________________\n""")
+Memberships = MemberRegistry()
+Store = None
+Expiry = None
+CheckIns = None
 
 def search():
     clear()
     print("""Search by:
 
 1 - Membership ID
-2 - First Name 
+2 - Name (first or last, part of it, typos are OK)
 3 - Membership Status 
                         """)
     search_choice = input("Enter Your Choice: ")
@@ -38,28 +34,25 @@ def search():
 
     if search_choice == "1":
         ID = input("Enter The Membership ID To Search: ")
-        for member in Memberships:
-            if member.Membership == ID:
-                member.display()
-                found = True
+        member = Memberships.get(ID)
+        if member:
+            member.display()
+            found = True
         if not found:
             print("Member not found.")
     elif search_choice == "2":
-        first_name = input("Enter The First Name To Search: ")
-        for member in Memberships:
-            if member.FirstName.lower() == first_name.lower():
-                member.display()
-                found = True
+        name = input("Enter The Name To Search: ")
+        for member in Memberships.search_names(name):
+            member.display()
+            found = True
         if not found:
             print("Member not found.")
     elif search_choice == "3":
         status = input("Enter The Membership Status To Search: ")
         clear()
-        time.sleep(2)
-        for member in Memberships:
-            if member.Status.lower() == status.lower():
-                member.display()
-                found = True
+        for member in Memberships.find_by_status(status):
+            member.display()
+            found = True
         if not found:
             print("Member not found.")
     else:
@@ -67,30 +60,123 @@ def search():
     input("Press Enter to Exit....")
 
 def initialize_file():
-    if not os.path.exists("members.xlsx"):
-        df = pd.DataFrame(columns=["First Name", "Last Name", "Membership ID", "Membership Status"])
-        df.to_excel("members.xlsx", index=False)
+    global Store
+    first_run = not os.path.exists(DB_FILE)
+    Store = MemberStore(DB_FILE)
+    # Members saved by older versions live in members.xlsx, copy them over once
+    if first_run and os.path.exists(EXCEL_FILE):
+        print(f"Imported {Store.import_excel(EXCEL_FILE)} members from {EXCEL_FILE}")
+
+def load_members():
+    """Stream the saved members into Memberships chunk by chunk."""
+    start = time.perf_counter()
+    for chunk in Store.iter_chunks():
+        for row in chunk:
+            Memberships.add(User(*row))
+    notify(f"Loaded {len(Memberships)} members in {time.perf_counter() - start:.2f}s")
+
+def expire_member(member):
+    """Set the member inactive, returns False if they already were."""
+    if member.Status.casefold() == "inactive":
+        return False
+    Memberships.set_status(member.Membership, "inactive")
+    Store.set_status(member.Membership, "inactive")
+    return True
+
+def check_expirations():
+    """Flip members whose membership ended to inactive, only looks at the top of the heap."""
+    expired = Expiry.run_due(expire_member)
+    if expired:
+        notify(f"{expired} memberships expired and were set to inactive.")
+
+def show_upcoming():
+    days = ask_days("Show memberships ending within how many days? (press Enter for 7): ", 7)
+    members = Expiry.upcoming(days)
+    if not members:
+        print("No memberships are ending soon.")
+    for member in members:
+        print(f"{member.ExpiryDate}  {member.Membership}  {member.FirstName} {member.LastName}")
+    input("Press Enter to Exit....")
+
+def check_in_member():
+    membership = input("Enter the Membership ID to check in: ").strip()
+    member = Memberships.get(membership)
+    if member is None:
+        notify("Member not found.")
+    elif member.Status.casefold() != "active":
+        notify(f"{member.FirstName}'s membership is {member.Status}, check-in refused.")
+    else:
+        CheckIns.check_in(membership)
+        notify(f"Welcome {member.FirstName}! You have {CheckIns.visits_in_month(membership)} visits this month.")
+
+def show_visit_reports():
+    print("Peak hours over the last 30 days:")
+    peaks = CheckIns.peak_hours(30)
+    if not peaks:
+        print("  No visits yet.")
+    for hour, visits in peaks[:5]:
+        print(f"  {hour}:00 - {visits} visits")
+    print(f"Visits today: {CheckIns.visits_on(date.today().isoformat())}")
+    membership = input("Enter a Membership ID for its visits this month (or press Enter to skip): ").strip()
+    if membership:
+        print(f"Visits this month: {CheckIns.visits_in_month(membership)}")
+    input("Press Enter to Exit....")
+
+def ask_date(prompt, default):
+    while True:
+        value = input(prompt).strip() or default
+        try:
+            date.fromisoformat(value)
+            return value
+        except ValueError:
+            print("Please use the format YYYY-MM-DD.")
+
+def ask_days(prompt, default):
+    while True:
+        value = input(prompt).strip()
+        if not value:
+            return default
+        if value.isdigit() and 0 < int(value) <= MAX_DAYS:
+            return int(value)
+        print(f"Please enter a number of days from 1 to {MAX_DAYS}.")
 
 def save_to_file(user):
-    df = pd.read_excel("members.xlsx")
-    new_row = {"First Name": user.FirstName, "Last Name": user.LastName, "Membership ID": user.Membership, "Membership Status": user.Status}
-    df = df.append(new_row, ignore_index=True)
-    df.to_excel("members.xlsx", index=False)
+    Store.add(user)
+
+def update_file(membership):
+    Store.delete(membership)
 
-def update_file():
-    data = [{"First Name": member.FirstName, "Last Name": member.LastName, "Membership ID": member.Membership, "Membership Status": member.Status} for member in Memberships]
-    df = pd.DataFrame(data)
-    df.to_excel("members.xlsx", index=False)
+def export_file():
+    path = input(f"Export to (.csv or .xlsx, press Enter for {EXCEL_FILE}): ").strip() or EXCEL_FILE
+    count = export_members(Store, path)
+    notify(f"Exported {count} members to {path}")
+
+def import_file():
+    path = input("Enter the CSV or Excel file to import: ").strip()
+    if not os.path.exists(path):
+        notify("File not found.")
+        return
+    start = time.perf_counter()
+    added, errors = import_members(path, Memberships, Store)
+    # One heapify over the roster is cheaper than pushing every new member
+    global Expiry
+    Expiry = ExpiryEngine(Memberships)
+    print(f"Imported {added} members in {time.perf_counter() - start:.2f}s")
+    if errors:
+        print(f"{len(errors)} rows were skipped:")
+        for line, reason in errors[:20]:
+            print(f"  line {line}: {reason}")
+        if len(errors) > 20:
+            print(f"  ... and {len(errors) - 20} more")
+    input("Press Enter to Exit....")
 
 def add_member():
     first_name = input("Enter First Name: ")
     last_name = input("Enter Last Name: ")
     while True:
         membership = input("Enter Membership ID: ")
-        if any(x.Membership == membership for x in Memberships):
-            time.sleep(2)
+        if membership in Memberships:
             print(f"'{membership}' already exists, please choose a different ID")
-            time.sleep(5)
         else:
             break
 
@@ -98,39 +184,56 @@ def add_member():
     if not status:
         status = "inactive"
 
-    print("Member added successfully!")
-    time.sleep(3)
+    start_date = ask_date("Enter Start Date (YYYY-MM-DD) or press Enter for today: ", date.today().isoformat())
+    while True:
+        days = ask_days(f"Enter Membership Length in days or press Enter for {DEFAULT_DAYS}: ", DEFAULT_DAYS)
+        try:
+            expiry_date = expiry_for(start_date, days)
+            break
+        except OverflowError:
+            print("That would end after the year 9999, please enter fewer days.")
+
+    notify("Member added successfully!")
 
-    new_user = User(first_name, last_name, membership, status)
+    new_user = User(first_name, last_name, membership, status, start_date, expiry_date)
     save_to_file(new_user)
     return new_user
 
 def delete_member():
     membership = input("Enter the Membership ID of the member to delete: ")
-    global Memberships
-    new_memberships = [member for member in Memberships if member.Membership != membership]
-    if len(new_memberships) == len(Memberships):
-        print("Member not found.")
-        time.sleep(2)
+    if Memberships.remove(membership) is None:
+        notify("Member not found.")
     else:
-        Memberships = new_memberships
-        update_file()
-        print("Member deleted successfully!")
-        time.sleep(2)
+        update_file(membership)
+        notify("Member deleted successfully!")
+
+def ask_view_options():
+    status = input("Filter by status (or press Enter for all): ").strip()
+    sort_by = input(f"Sort by ({'/'.join(SORT_COLUMNS)}) or press Enter to keep the order added: ").strip().lower()
+    return status or None, sort_by if sort_by in SORT_COLUMNS else None
+
+def display_members():
+    status, sort_by = ask_view_options()
+    if sort_by:
+        # The database has an index for every sort key, sorting in memory would touch every member first
+        view_pages(store_pages(Store, status=status, sort_by=sort_by), clear)
+    else:
+        view_pages(registry_pages(Memberships, status=status), clear)
 
 def display_file():
     clear()
-    try:
-        df = pd.read_excel("members.xlsx")
-        print(tabulate(df, headers="keys", tablefmt="grid", showindex=False))
-    except FileNotFoundError:
-        print("The members.xlsx file does not exist.")
-    input("Press Enter to Exit....")
+    status, sort_by = ask_view_options()
+    view_pages(store_pages(Store, status=status, sort_by=sort_by), clear)
 
 def main():
+    global Expiry, CheckIns
     initialize_file()
+    CheckIns = CheckInLog(DB_FILE)
+    load_members()
+    Expiry = ExpiryEngine(Memberships)
 
     while True:
+        check_expirations()
         clear()
         print("""Welcome To Gym Membership Management
 
@@ -140,36 +243,52 @@ Choose an Action:
 3 - Search for a member
 4 - Display members from file
 5 - Delete a member
-6 - Exit
+6 - Export members (CSV or Excel)
+7 - Import members (CSV or Excel)
+8 - Upcoming expirations
+9 - Check in a member
+10 - Visit reports
+11 - Exit
         """)
         try:
             choice = int(input("Enter Your Choice: "))
             if choice == 1:
                 clear()
-                Memberships.append(add_member())
+                new_user = add_member()
+                Memberships.add(new_user)
+                Expiry.schedule(new_user)
             elif choice == 2:
                 clear()
                 if Memberships:
-                    data = [[member.FirstName, member.LastName, member.Membership, member.Status] for member in Memberships]
-                    print(tabulate(data, headers=["First Name", "Last Name", "Membership ID", "Membership Status"], tablefmt="grid"))
-                    input("Press Enter to Exit....")
+                    display_members()
                 else:
-                    print('No members to display.')
-                    time.sleep(3)
+                    notify('No members to display.')
             elif choice == 3:
-                search() if Memberships else print("No members to search.")
-                time.sleep(3)
+                search() if Memberships else notify("No members to search.")
             elif choice == 4:
                 display_file()
             elif choice == 5:
-                delete_member() if Memberships else print("No members to delete.")
+                delete_member() if Memberships else notify("No members to delete.")
             elif choice == 6:
+                export_file()
+            elif choice == 7:
+                clear()
+                import_file()
+            elif choice == 8:
+                clear()
+                show_upcoming()
+            elif choice == 9:
+                clear()
+                check_in_member()
+            elif choice == 10:
+                clear()
+                show_visit_reports()
+            elif choice == 11:
                 break
             else:
-                print("Invalid choice. Please try again.")
-                time.sleep(3)
+                notify("Invalid choice. Please try again.")
         except ValueError:
-            print("Invalid input. Please enter a number.")
+            notify("Invalid input. Please enter a number.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,307 @@
+# Hybrid file encryption (the idea from ُEncryption.py, for real files)
+#
+# - A random Fernet key encrypts the file data (fast).
+# - The recipient's RSA public key wraps the Fernet key with OAEP (safe to share).
+# - Only the RSA private key can unwrap the Fernet key and read the data.
+#
+# File layout:
+#   MAGIC | 16 bytes file ID | 2 bytes wrapped key length | wrapped key | frames...
+#   frame = 4 bytes token length | Fernet token of (file ID + 8 bytes index + 1 byte last flag + chunk)
+# The index and last flag stop anyone from reordering or cutting off frames.
+# All files in a run share one Fernet key, so the random file ID inside every
+# frame is what stops frames being swapped between two files.
+
+import os
+import sys
+import time
+import struct
+import shutil
+import hashlib
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives import serialization, hashes
+
+MAGIC = b"HYB2"
+FILE_ID_SIZE = 16
+SUFFIX = ".hyb"
+CHUNK_SIZE = 1 << 20  # 1 MiB of plain data per frame
+
+OAEP = padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None)
+
+
+# ====== RSA Keys ======
+def generate_keys(private_path, public_path, passphrase=None, key_size=3072):
+    """Create an RSA key pair and save both halves as PEM files."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+    if passphrase:
+        protection = serialization.BestAvailableEncryption(passphrase.encode())
+    else:
+        protection = serialization.NoEncryption()
+    # Owner-only from the first byte, the key may not be encrypted. An existing
+    # file keeps its old mode through O_TRUNC, so it is set again explicitly.
+    fd = os.open(private_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.chmod(private_path, 0o600)
+    with open(fd, "wb") as file:
+        file.write(private_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, protection))
+    with open(public_path, "wb") as file:
+        file.write(private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo))
+
+
+def load_public_key(path):
+    with open(path, "rb") as file:
+        return serialization.load_pem_public_key(file.read())
+
+
+def load_private_key(path, passphrase=None):
+    with open(path, "rb") as file:
+        return serialization.load_pem_private_key(file.read(), passphrase.encode() if passphrase else None)
+
+
+# ====== Session Keys ======
+# Wrapping costs one RSA operation and unwrapping costs a lot more,
+# so both directions are cached instead of being redone for every file.
+_wrapped_for = {}    # recipient fingerprint -> (fernet key, wrapped key)
+_unwrapped = {}      # wrapped key -> fernet key
+
+
+def _fingerprint(public_key):
+    der = public_key.public_bytes(serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo)
+    return hashlib.sha256(der).hexdigest()
+
+
+def session_key_for(public_key):
+    """Return (fernet key, wrapped key) for a recipient, made once per process."""
+    fingerprint = _fingerprint(public_key)
+    if fingerprint not in _wrapped_for:
+        key = Fernet.generate_key()
+        _wrapped_for[fingerprint] = (key, public_key.encrypt(key, OAEP))
+    return _wrapped_for[fingerprint]
+
+
+def unwrap_session_key(private_key, wrapped):
+    if wrapped not in _unwrapped:
+        _unwrapped[wrapped] = private_key.decrypt(wrapped, OAEP)
+    return _unwrapped[wrapped]
+
+
+# ====== Single Files ======
+def _write_frame(out, cipher, file_id, index, last, chunk):
+    token = cipher.encrypt(file_id + struct.pack(">Q?", index, last) + chunk)
+    out.write(struct.pack(">I", len(token)))
+    out.write(token)
+
+
+def encrypt_file(src_path, dst_path, session_key, chunk_size=CHUNK_SIZE):
+    """Stream `src_path` into `dst_path` chunk by chunk. session_key = (key, wrapped)."""
+    key, wrapped = session_key
+    cipher = Fernet(key)
+    file_id = os.urandom(FILE_ID_SIZE)
+    tmp_path = dst_path + ".tmp"
+    try:
+        with open(src_path, "rb") as src, open(tmp_path, "wb") as out:
+            out.write(MAGIC + file_id + struct.pack(">H", len(wrapped)) + wrapped)
+            index = 0
+            chunk = src.read(chunk_size)
+            while True:
+                following = src.read(chunk_size)
+                _write_frame(out, cipher, file_id, index, not following, chunk)
+                if not following:
+                    break
+                chunk = following
+                index += 1
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, dst_path)
+    return os.path.getsize(src_path)
+
+
+def _read_exact(file, size):
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("file is truncated")
+    return data
+
+
+def decrypt_file(src_path, dst_path, private_key):
+    """Reverse of encrypt_file. Raises ValueError on a damaged or foreign file."""
+    tmp_path = dst_path + ".tmp"
+    written = 0
+    try:
+        with open(src_path, "rb") as src, open(tmp_path, "wb") as out:
+            if src.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{src_path} is not a hybrid-encrypted file (or an older format)")
+            file_id = _read_exact(src, FILE_ID_SIZE)
+            (wrapped_size,) = struct.unpack(">H", _read_exact(src, 2))
+            cipher = Fernet(unwrap_session_key(private_key, _read_exact(src, wrapped_size)))
+            start = FILE_ID_SIZE + 9
+            expected = 0
+            last = False
+            while not last:
+                (token_size,) = struct.unpack(">I", _read_exact(src, 4))
+                try:
+                    plain = cipher.decrypt(_read_exact(src, token_size))
+                except InvalidToken:
+                    # Not a ValueError by itself, so callers would miss it
+                    raise ValueError(f"{src_path} has been tampered with or is damaged") from None
+                if plain[:FILE_ID_SIZE] != file_id:
+                    raise ValueError("frame belongs to a different file")
+                index, last = struct.unpack(">Q?", plain[FILE_ID_SIZE:start])
+                if index != expected:
+                    raise ValueError("frames are out of order")
+                out.write(plain[start:])
+                written += len(plain) - start
+                expected += 1
+            if src.read(1):
+                raise ValueError("unexpected data after the last frame")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, dst_path)
+    return written
+
+
+# ====== Directory Trees With A Process Pool ======
+# Every worker loads the keys once in _init_worker, not once per file.
+_worker = {}
+
+
+def _init_worker(public_path, private_path, passphrase, session_key):
+    if public_path:
+        _worker["session_key"] = session_key
+    if private_path:
+        _worker["private_key"] = load_private_key(private_path, passphrase)
+
+
+def _encrypt_job(paths):
+    return encrypt_file(paths[0], paths[1], _worker["session_key"])
+
+
+def _decrypt_job(paths):
+    return decrypt_file(paths[0], paths[1], _worker["private_key"])
+
+
+def _plan(src, dst, encrypting):
+    """List (source, target) pairs and make the target folders up front."""
+    if os.path.isfile(src):
+        return [(src, dst)]
+    jobs = []
+    for root, _, files in os.walk(src):
+        target_root = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(target_root, exist_ok=True)
+        for name in files:
+            if encrypting:
+                target = name + SUFFIX
+            elif name.endswith(SUFFIX):
+                target = name[:-len(SUFFIX)]
+            else:
+                continue
+            jobs.append((os.path.join(root, name), os.path.join(target_root, target)))
+    return jobs
+
+
+def _run(jobs, job, initargs, workers):
+    # A single file isn't worth starting processes for
+    if len(jobs) <= 1 or workers == 1:
+        _init_worker(*initargs)
+        return sum(job(paths) for paths in jobs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+        return sum(pool.map(job, jobs, chunksize=max(1, len(jobs) // (8 * (workers or os.cpu_count())))))
+
+
+def encrypt_path(src, dst, public_path, workers=None):
+    """Encrypt a file or a whole folder. Returns the number of plain bytes read."""
+    session_key = session_key_for(load_public_key(public_path))
+    return _run(_plan(src, dst, True), _encrypt_job, (public_path, None, None, session_key), workers)
+
+
+def decrypt_path(src, dst, private_path, passphrase=None, workers=None):
+    """Decrypt a file or a whole folder of .hyb files. Returns the number of plain bytes written."""
+    return _run(_plan(src, dst, False), _decrypt_job, (None, private_path, passphrase, None), workers)
+
+
+# ====== Benchmark ======
+def benchmark(total_mb=1024, files=256, workers=None):
+    """Encrypt and decrypt a synthetic corpus of `total_mb` MB and print the throughput."""
+    folder = tempfile.mkdtemp(prefix="hybrid_bench_")
+    try:
+        plain, sealed, opened = (os.path.join(folder, name) for name in ("plain", "sealed", "opened"))
+        os.makedirs(plain)
+        file_size = total_mb * (1 << 20) // files
+        block = os.urandom(1 << 20)
+        for number in range(files):
+            with open(os.path.join(plain, f"file_{number:05}.bin"), "wb") as file:
+                for offset in range(0, file_size, len(block)):
+                    file.write(block[:file_size - offset])
+        private_path = os.path.join(folder, "private.pem")
+        public_path = os.path.join(folder, "public.pem")
+        generate_keys(private_path, public_path, key_size=2048)
+
+        start = time.perf_counter()
+        size = encrypt_path(plain, sealed, public_path, workers)
+        middle = time.perf_counter()
+        decrypt_path(sealed, opened, private_path, workers=workers)
+        end = time.perf_counter()
+
+        mb = size / (1 << 20)
+        print(f"Corpus: {files} files, {mb:,.0f} MB")
+        print(f"Encrypt: {middle - start:.2f}s ({mb / (middle - start):,.0f} MB/s)")
+        print(f"Decrypt: {end - middle:.2f}s ({mb / (end - middle):,.0f} MB/s)")
+    finally:
+        shutil.rmtree(folder)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hybrid RSA + Fernet file encryption")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    keygen = commands.add_parser("keygen", help="create an RSA key pair")
+    keygen.add_argument("private_key")
+    keygen.add_argument("public_key")
+    keygen.add_argument("--passphrase")
+
+    encrypt = commands.add_parser("encrypt", help="encrypt a file or folder")
+    encrypt.add_argument("source")
+    encrypt.add_argument("target")
+    encrypt.add_argument("--public-key", required=True)
+    encrypt.add_argument("--workers", type=int)
+
+    decrypt = commands.add_parser("decrypt", help="decrypt a file or folder")
+    decrypt.add_argument("source")
+    decrypt.add_argument("target")
+    decrypt.add_argument("--private-key", required=True)
+    decrypt.add_argument("--passphrase")
+    decrypt.add_argument("--workers", type=int)
+
+    bench = commands.add_parser("bench", help="measure throughput on a synthetic corpus")
+    bench.add_argument("--size-mb", type=int, default=1024)
+    bench.add_argument("--files", type=int, default=256)
+    bench.add_argument("--workers", type=int)
+
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    if args.command == "keygen":
+        generate_keys(args.private_key, args.public_key, args.passphrase)
+        print(f"Keys saved to {args.private_key} and {args.public_key}")
+    elif args.command == "encrypt":
+        size = encrypt_path(args.source, args.target, args.public_key, args.workers)
+        print(f"Encrypted {size / (1 << 20):,.1f} MB in {time.perf_counter() - start:.2f}s")
+    elif args.command == "decrypt":
+        try:
+            size = decrypt_path(args.source, args.target, args.private_key, args.passphrase, args.workers)
+        except ValueError as error:
+            print(f"Could not decrypt: {error}")
+            return 1
+        print(f"Decrypted {size / (1 << 20):,.1f} MB in {time.perf_counter() - start:.2f}s")
+    else:
+        benchmark(args.size_mb, args.files, args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
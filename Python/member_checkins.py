@@ -0,0 +1,137 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+from member_store import DB_FILE
+
+
+class CheckInLog:
+    """
+    Gym visits: an append-only log plus counters kept up to date on every insert.
+
+    - checkins:            one row per visit, never updated or deleted
+    - visits_hourly:       "YYYY-MM-DD HH"      -> number of visits
+    - visits_member_daily: (ID, "YYYY-MM-DD")   -> number of visits
+
+    The reports read the counters, so "peak hours" looks at 24 rows a day
+    and "visits this month" at one row per day, however many raw visits
+    have been logged.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS checkins (
+                id            INTEGER PRIMARY KEY,
+                membership_id TEXT NOT NULL,
+                at            TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS visits_hourly (
+                hour  TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS visits_member_daily (
+                membership_id TEXT NOT NULL,
+                day           TEXT NOT NULL,
+                count         INTEGER NOT NULL,
+                PRIMARY KEY (membership_id, day)
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+
+    def check_in(self, membership_id, at=None):
+        self.check_in_many([(membership_id, at or datetime.now())])
+
+    def check_in_many(self, visits):
+        """Log many (ID, datetime) visits in one transaction."""
+        rows = [(membership_id, at.strftime("%Y-%m-%d %H:%M:%S")) for membership_id, at in visits]
+        # Add the batch up first, so each counter row is written once per batch
+        hourly = Counter(stamp[:13] for _, stamp in rows)
+        daily = Counter((membership_id, stamp[:10]) for membership_id, stamp in rows)
+        with self.conn:
+            self.conn.executemany("INSERT INTO checkins (membership_id, at) VALUES (?, ?)", rows)
+            self.conn.executemany(
+                "INSERT INTO visits_hourly VALUES (?, ?) "
+                "ON CONFLICT (hour) DO UPDATE SET count = count + excluded.count", hourly.items())
+            self.conn.executemany(
+                "INSERT INTO visits_member_daily VALUES (?, ?, ?) "
+                "ON CONFLICT (membership_id, day) DO UPDATE SET count = count + excluded.count",
+                ((membership_id, day, count) for (membership_id, day), count in daily.items()))
+
+    # ====== Reports ======
+    def peak_hours(self, days=30, today=None):
+        """[(hour of day, visits)] over the last `days` days, busiest first."""
+        today = today or datetime.now()
+        start = (today - timedelta(days=days - 1)).strftime("%Y-%m-%d 00")
+        end = today.strftime("%Y-%m-%d 23")
+        return self.conn.execute(
+            "SELECT substr(hour, 12, 2) AS hour_of_day, SUM(count) AS visits FROM visits_hourly "
+            "WHERE hour BETWEEN ? AND ? GROUP BY hour_of_day ORDER BY visits DESC", (start, end)).fetchall()
+
+    def visits_in_month(self, membership_id, month=None):
+        """Number of visits by one member in "YYYY-MM" (this month by default)."""
+        month = month or datetime.now().strftime("%Y-%m")
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM visits_member_daily "
+            "WHERE membership_id = ? AND day BETWEEN ? AND ?",
+            (membership_id, month + "-01", month + "-31")).fetchone()[0]
+
+    def visits_on(self, day):
+        """Total visits on "YYYY-MM-DD"."""
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM visits_hourly WHERE hour BETWEEN ? AND ?",
+            (day + " 00", day + " 23")).fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+# ====== Benchmark ======
+def benchmark(count=3_000_000, members=20_000, days=90):
+    """Log `count` synthetic check-ins, then compare counter reports with raw scans."""
+    folder = tempfile.mkdtemp(prefix="checkins_")
+    log = CheckInLog(os.path.join(folder, "members.db"))
+    today = datetime(2025, 6, 30, 22)
+    first = today - timedelta(days=days)
+    seconds = int((today - first).total_seconds())
+    rng = random.Random(7)
+
+    start = time.perf_counter()
+    batch = []
+    for _ in range(count):
+        batch.append((str(rng.randrange(members)), first + timedelta(seconds=rng.randrange(seconds))))
+        if len(batch) == 50_000:
+            log.check_in_many(batch)
+            batch = []
+    log.check_in_many(batch)
+    elapsed = time.perf_counter() - start
+    print(f"Logged {count:,} check-ins in {elapsed:.1f}s ({count / elapsed:,.0f} per second)")
+
+    def timed(label, run):
+        start = time.perf_counter()
+        run()
+        print(f"  {label:38} {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    print("From counters:")
+    timed("peak hours, last 30 days", lambda: log.peak_hours(30, today))
+    timed("visits by member 42 in 2025-06", lambda: log.visits_in_month("42", "2025-06"))
+    print("Scanning raw check-ins:")
+    timed("peak hours, last 30 days", lambda: log.conn.execute(
+        "SELECT substr(at, 12, 2) h, COUNT(*) c FROM checkins WHERE at >= ? GROUP BY h ORDER BY c DESC",
+        ((today - timedelta(days=29)).strftime("%Y-%m-%d"),)).fetchall())
+    timed("visits by member 42 in 2025-06", lambda: log.conn.execute(
+        "SELECT COUNT(*) FROM checkins WHERE membership_id = ? AND at LIKE ?", ("42", "2025-06%")).fetchone())
+    log.close()
+    for name in os.listdir(folder):
+        os.remove(os.path.join(folder, name))
+    os.rmdir(folder)
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:2]))
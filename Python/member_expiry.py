@@ -0,0 +1,70 @@
+import heapq
+from datetime import date, timedelta
+
+# Membership length used when the user just presses Enter
+DEFAULT_DAYS = 30
+# Longest length accepted, anything bigger runs past what a date can hold
+MAX_DAYS = 36500
+
+
+def expiry_for(start_date, days=DEFAULT_DAYS):
+    """Return the "YYYY-MM-DD" expiry for a membership starting on start_date."""
+    return (date.fromisoformat(start_date) + timedelta(days=days)).isoformat()
+
+
+class ExpiryEngine:
+    """
+    Min-heap of (expiry date, membership ID), earliest expiry on top.
+
+    Checking what is due only looks at the top of the heap, so each
+    expiration costs O(log n) instead of a scan over the whole roster.
+    Members that were deleted or renewed leave stale entries behind;
+    those are skipped when they reach the top (lazy deletion).
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.heap = [(member.ExpiryDate, member.Membership) for member in registry if member.ExpiryDate]
+        heapq.heapify(self.heap)
+
+    def schedule(self, member):
+        if member.ExpiryDate:
+            heapq.heappush(self.heap, (member.ExpiryDate, member.Membership))
+
+    def _is_current(self, expiry_date, membership_id):
+        member = self.registry.get(membership_id)
+        return member is not None and member.ExpiryDate == expiry_date
+
+    def run_due(self, on_expire, today=None):
+        """
+        Call on_expire(member) for every membership that has expired by today.
+        Returns how many calls returned True, i.e. members that really changed.
+        """
+        today = (today or date.today()).isoformat()
+        expired = 0
+        while self.heap and self.heap[0][0] < today:
+            expiry_date, membership_id = heapq.heappop(self.heap)
+            if self._is_current(expiry_date, membership_id):
+                if on_expire(self.registry.get(membership_id)):
+                    expired += 1
+        return expired
+
+    def upcoming(self, days=7, today=None):
+        """
+        Members whose membership ends within `days` days, soonest first.
+
+        Entries are popped until the first one past the window and then
+        pushed back, so the cost is O(k log n) for k results.
+        """
+        today = today or date.today()
+        limit = (today + timedelta(days=days)).isoformat()
+        taken = []
+        found = []
+        while self.heap and self.heap[0][0] <= limit:
+            entry = heapq.heappop(self.heap)
+            if self._is_current(*entry):
+                taken.append(entry)
+                found.append(self.registry.get(entry[1]))
+        for entry in taken:
+            heapq.heappush(self.heap, entry)
+        return found
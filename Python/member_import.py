@@ -0,0 +1,239 @@
+import io
+import os
+import csv
+import sys
+import time
+import tempfile
+from itertools import islice
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from member_records import User
+from member_registry import MemberRegistry
+from datetime import date
+from member_store import MemberStore, COLUMNS, DATE_COLUMNS
+
+# Lines per batch handed to a parsing worker
+BATCH_LINES = 20_000
+
+# Smaller CSV files are parsed in this process, starting workers would cost more
+PARALLEL_MIN_BYTES = 4 << 20
+
+
+# ====== Parsing And Validation ======
+def _field_order(header):
+    """Map the file's header to positions of (first, last, ID, status, start, expiry); None if there is no header."""
+    names = [name.strip().casefold() for name in header]
+    wanted = [column.casefold() for column in COLUMNS + DATE_COLUMNS]
+    if not set(wanted[:3]) <= set(names):
+        return None
+    return [names.index(column) if column in names else None for column in wanted]
+
+
+def validate_rows(rows, order):
+    """
+    Check raw (line number, row) pairs, returns (good rows, errors).
+
+    A good row is (line number, (first name, last name, ID, status, start, expiry)).
+    Errors are (line number, reason) pairs so the user can fix the file.
+    """
+    order = order or [0, 1, 2, 3, 4, 5]
+    good = []
+    errors = []
+    for line, row in rows:
+        if not any(cell.strip() for cell in row):
+            continue
+        first, last, membership, status, start, expiry = (
+            row[i].strip() if i is not None and i < len(row) else "" for i in order)
+        # Excel cells come back as "2025-01-31 00:00:00"
+        start, expiry = start[:10], expiry[:10]
+        if not first:
+            errors.append((line, "first name is empty"))
+        elif not membership:
+            errors.append((line, "membership ID is empty"))
+        elif any(ch.isspace() for ch in membership):
+            errors.append((line, f"membership ID '{membership}' contains spaces"))
+        elif not _valid_dates(start, expiry):
+            errors.append((line, "dates must look like YYYY-MM-DD"))
+        else:
+            good.append((line, (first, last, membership, status or "inactive", start or None, expiry or None)))
+    return good, errors
+
+
+def _valid_dates(*values):
+    try:
+        for value in values:
+            if value:
+                date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _numbered(reader, first_line):
+    """(line number, row) pairs, a row whose quoted cells hold line breaks gets the line it starts on."""
+    start = 0
+    for row in reader:
+        yield first_line + start, row
+        start = reader.line_num
+
+
+def _parse_csv_batch(job):
+    text, order, first_line = job
+    return validate_rows(_numbered(csv.reader(io.StringIO(text)), first_line), order)
+
+
+def _whole_records(file, lines):
+    """
+    Read on until `lines` ends on a record boundary.
+
+    A quoted cell may hold line breaks; while the lines so far have an odd
+    number of quote characters, the last one is still inside such a cell.
+    A stray quote in an unquoted cell only makes the batch longer.
+    """
+    quotes = sum(line.count('"') for line in lines)
+    while quotes % 2:
+        line = file.readline()
+        if not line:
+            break
+        lines.append(line)
+        quotes += line.count('"')
+    return lines
+
+
+def _csv_batches(file, first_line):
+    """Yield (text, first line number) batches of about BATCH_LINES lines, never cutting a record in two."""
+    line = first_line
+    while True:
+        lines = _whole_records(file, list(islice(file, BATCH_LINES)))
+        if not lines:
+            return
+        yield "".join(lines), line
+        line += len(lines)
+
+
+def parse_csv(path, workers=None):
+    """
+    Yield (good rows, errors) per batch, parsed by a process pool for big files.
+
+    At most two batches per worker are read ahead of the one being
+    yielded, so a huge file is never all in memory at once.
+    """
+    with open(path, "r", newline="", encoding="utf-8-sig") as file:
+        first_record = _whole_records(file, [file.readline()])
+        first_row = next(csv.reader(io.StringIO("".join(first_record))), [])
+        order = _field_order(first_row)
+        if order is None:
+            # No header, the first record is a member too
+            yield validate_rows([(1, first_row)], None)
+        jobs = ((text, order, line) for text, line in _csv_batches(file, 1 + len(first_record)))
+        if os.path.getsize(path) < PARALLEL_MIN_BYTES or workers == 1:
+            yield from map(_parse_csv_batch, jobs)
+            return
+        workers = workers or os.cpu_count() or 4
+        in_flight = deque()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for job in jobs:
+                in_flight.append(pool.submit(_parse_csv_batch, job))
+                if len(in_flight) >= workers * 2:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+
+def parse_excel(path):
+    """Yield (good rows, errors) per batch from a workbook opened in read-only mode."""
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True)
+    rows = (["" if cell is None else str(cell) for cell in row]
+            for row in workbook.active.iter_rows(values_only=True))
+    try:
+        header = next(rows, [])
+        order = _field_order(header)
+        if order is None:
+            yield validate_rows([(1, header)], None)
+        line = 2
+        while True:
+            batch = list(islice(rows, BATCH_LINES))
+            if not batch:
+                return
+            yield validate_rows(enumerate(batch, start=line), order)
+            line += len(batch)
+    finally:
+        workbook.close()
+
+
+# ====== Import ======
+def import_members(path, registry, store, workers=None):
+    """
+    Bulk-add members from a CSV or XLSX file.
+
+    Rows are validated, then checked against the registry's ID index and
+    against earlier rows of the same file. Everything that passes is
+    written to the store in a single transaction, then added to the registry.
+    Returns (number added, list of (line, reason) errors).
+    """
+    batches = parse_excel(path) if path.lower().endswith((".xlsx", ".xlsm")) else parse_csv(path, workers)
+    new_members = []
+    seen = set()
+    errors = []
+    for good, bad in batches:
+        errors.extend(bad)
+        for line, row in good:
+            membership = row[2]
+            if membership in registry or membership in seen:
+                errors.append((line, f"membership ID '{membership}' already exists"))
+                continue
+            seen.add(membership)
+            new_members.append(User(*row))
+    store.add_many(new_members)
+    for member in new_members:
+        registry.add(member)
+    return len(new_members), errors
+
+
+# ====== Export ======
+def export_members(store, path):
+    """Stream every member into a CSV or XLSX file, returns how many were written."""
+    if path.lower().endswith(".xlsx"):
+        return store.export_excel(path)
+    count = 0
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS + DATE_COLUMNS)
+        for row in store.rows():
+            writer.writerow(row)
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+# ====== Benchmark ======
+def benchmark(count=200_000):
+    """Import a synthetic partner gym of `count` members into an empty store."""
+    folder = tempfile.mkdtemp(prefix="member_import_")
+    csv_path = os.path.join(folder, "partner.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        for i in range(count):
+            writer.writerow([f"Member{i}", "Partner", f"P{i}", "active" if i % 4 else "inactive"])
+    store = MemberStore(os.path.join(folder, "members.db"))
+    registry = MemberRegistry()
+
+    start = time.perf_counter()
+    added, errors = import_members(csv_path, registry, store)
+    middle = time.perf_counter()
+    exported = export_members(store, os.path.join(folder, "export.csv"))
+    end = time.perf_counter()
+
+    print(f"Imported {added:,} members ({len(errors)} rejected) in {middle - start:.2f}s")
+    print(f"Exported {exported:,} members in {end - middle:.2f}s")
+    store.close()
+    for name in os.listdir(folder):
+        os.remove(os.path.join(folder, name))
+    os.rmdir(folder)
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,157 @@
+import sys
+import time
+import tracemalloc
+from array import array
+
+
+def intern_status(status):
+    """Every "active" / "inactive" in the roster points at one shared string."""
+    return sys.intern(status)
+
+
+class User:
+    # No per-member __dict__, a big roster takes far less memory
+    __slots__ = ("FirstName", "LastName", "Membership", "Status", "StartDate", "ExpiryDate")
+
+    def __init__(self, first_name, last_name, membership, status, start_date=None, expiry_date=None):
+        self.FirstName = first_name
+        self.LastName = last_name
+        self.Membership = membership
+        self.Status = intern_status(status)
+        # Dates are "YYYY-MM-DD" strings (or None), they sort the same as the dates themselves
+        self.StartDate = start_date
+        self.ExpiryDate = expiry_date
+
+    def display(self):
+        print(f""" First Name: {self.FirstName}
+ Last Name: {self.LastName}
+ Membership ID: {self.Membership}
+ Membership Status: {self.Status}
+ Start Date: {self.StartDate or "-"}
+ Expiry Date: {self.ExpiryDate or "-"}
+_________________________________\n""")
+
+
+class MemberColumns:
+    """
+    Struct-of-arrays roster for very large gyms.
+
+    Instead of one object per member there is one list per field, and the
+    status is a one-byte code into `statuses`. Names are interned, so the
+    thousands of "Mohamed"s share one string. remove() swaps the last row
+    into the hole, so it stays O(1).
+    """
+
+    def __init__(self):
+        self.first_names = []
+        self.last_names = []
+        self.ids = []
+        self.status_codes = array("B")
+        self.statuses = []       # code -> status text
+        self.status_code = {}    # status text -> code
+        self.row_of = {}         # Membership ID -> row number
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, membership_id):
+        return membership_id in self.row_of
+
+    def _code(self, status):
+        code = self.status_code.get(status)
+        if code is None:
+            if len(self.statuses) == 256:
+                raise ValueError("too many different statuses")
+            code = self.status_code[status] = len(self.statuses)
+            self.statuses.append(status)
+        return code
+
+    def add(self, first_name, last_name, membership, status):
+        if membership in self.row_of:
+            raise ValueError(f"'{membership}' already exists")
+        self.row_of[membership] = len(self.ids)
+        self.first_names.append(sys.intern(first_name))
+        self.last_names.append(sys.intern(last_name))
+        self.ids.append(membership)
+        self.status_codes.append(self._code(status))
+
+    def remove(self, membership_id):
+        """Remove a member, returns its row as a User or None if unknown."""
+        row = self.row_of.pop(membership_id, None)
+        if row is None:
+            return None
+        member = self._user(row)
+        last = len(self.ids) - 1
+        if row != last:
+            for column in (self.first_names, self.last_names, self.ids, self.status_codes):
+                column[row] = column[last]
+            self.row_of[self.ids[row]] = row
+        for column in (self.first_names, self.last_names, self.ids, self.status_codes):
+            column.pop()
+        return member
+
+    def _user(self, row):
+        return User(self.first_names[row], self.last_names[row], self.ids[row],
+                    self.statuses[self.status_codes[row]])
+
+    def get(self, membership_id):
+        row = self.row_of.get(membership_id)
+        return None if row is None else self._user(row)
+
+    def __iter__(self):
+        for row in range(len(self.ids)):
+            yield self._user(row)
+
+
+# ====== Benchmark ======
+class DictUser:
+    """The old User: every instance carries its own __dict__."""
+
+    def __init__(self, first_name, last_name, membership, status):
+        self.FirstName = first_name
+        self.LastName = last_name
+        self.Membership = membership
+        self.Status = status
+
+
+def _measure(build, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    roster = build(count)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del roster
+    return used / count
+
+
+def benchmark(count=1_000_000):
+    """Print bytes per member for each representation."""
+    first_names = ["Mohamed", "Ahmed", "Omar", "Sara", "Mona", "Youssef", "Nour", "Ali"]
+
+    def rows(n):
+        # encode().decode() makes a fresh string per row, the way they arrive from SQLite
+        for i in range(n):
+            yield (first_names[i % 8].encode().decode(), "Tamer".encode().decode(), str(i),
+                   ("active" if i % 3 else "inactive").encode().decode())
+
+    def build_dicts(n):
+        return {row[2]: DictUser(*row) for row in rows(n)}
+
+    def build_slots(n):
+        return {row[2]: User(*row) for row in rows(n)}
+
+    def build_columns(n):
+        roster = MemberColumns()
+        for row in rows(n):
+            roster.add(*row)
+        return roster
+
+    print(f"Bytes per member at {count:,} members (roster dict by ID included):")
+    for name, build in (("dict User", build_dicts), ("__slots__ User", build_slots), ("MemberColumns", build_columns)):
+        start = time.perf_counter()
+        per_member = _measure(build, count)
+        print(f"  {name:15} {per_member:7.0f} bytes  ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,113 @@
+import time
+from types import SimpleNamespace
+from member_search import NameIndex
+
+
+class MemberRegistry:
+    """
+    All gym members, indexed so lookups don't walk the whole list.
+
+    - by_id:     Membership ID        -> member
+    - by_name:   first name casefold  -> {Membership ID: member}
+    - by_status: status casefold      -> {Membership ID: member}
+    - names:     NameIndex over first and last names for prefix / fuzzy search
+
+    The inner dicts keep members in the order they were added and let
+    remove() drop a member from an index in O(1).
+    """
+
+    def __init__(self, members=()):
+        self.by_id = {}
+        self.by_name = {}
+        self.by_status = {}
+        self.names = NameIndex()
+        for member in members:
+            self.add(member)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __contains__(self, membership_id):
+        return membership_id in self.by_id
+
+    def add(self, member):
+        if member.Membership in self.by_id:
+            raise ValueError(f"'{member.Membership}' already exists")
+        self.by_id[member.Membership] = member
+        self.by_name.setdefault(member.FirstName.casefold(), {})[member.Membership] = member
+        self.by_status.setdefault(member.Status.casefold(), {})[member.Membership] = member
+        self.names.add(member.Membership, member.FirstName, member.LastName)
+
+    def remove(self, membership_id):
+        """Remove and return the member, or None if the ID is unknown."""
+        member = self.by_id.pop(membership_id, None)
+        if member is None:
+            return None
+        self._unindex(self.by_name, member.FirstName.casefold(), membership_id)
+        self._unindex(self.by_status, member.Status.casefold(), membership_id)
+        self.names.remove(membership_id)
+        return member
+
+    def _unindex(self, index, key, membership_id):
+        bucket = index[key]
+        del bucket[membership_id]
+        if not bucket:
+            del index[key]
+
+    def set_status(self, membership_id, status):
+        """Change a member's status and move it to the right status bucket."""
+        member = self.by_id[membership_id]
+        self._unindex(self.by_status, member.Status.casefold(), membership_id)
+        member.Status = status
+        self.by_status.setdefault(status.casefold(), {})[membership_id] = member
+
+    def get(self, membership_id):
+        return self.by_id.get(membership_id)
+
+    def find_by_first_name(self, first_name):
+        return list(self.by_name.get(first_name.casefold(), {}).values())
+
+    def find_by_status(self, status):
+        return list(self.by_status.get(status.casefold(), {}).values())
+
+    def search_names(self, query, limit=20):
+        """Best matching members for a (partial, possibly misspelled) name."""
+        return [self.by_id[membership_id] for _, membership_id in self.names.search(query, limit)]
+
+
+# ====== Benchmark ======
+def benchmark(count=1_000_000, lookups=1_000):
+    """Compare index lookups with the old linear scan over a plain list."""
+    first_names = ["Mohamed", "Ahmed", "Omar", "Sara", "Mona", "Youssef", "Nour", "Ali"]
+    members = [SimpleNamespace(FirstName=f"{first_names[i % 8]}{i % 5000}", LastName="Tamer",
+                               Membership=str(i), Status="active" if i % 3 else "inactive")
+               for i in range(count)]
+
+    start = time.perf_counter()
+    registry = MemberRegistry(members)
+    print(f"Indexed {len(registry):,} members in {time.perf_counter() - start:.2f}s")
+
+    wanted = [str(i * (count // lookups)) for i in range(lookups)]
+    start = time.perf_counter()
+    for membership_id in wanted:
+        registry.get(membership_id)
+        membership_id in registry
+    per_lookup = (time.perf_counter() - start) / lookups
+    print(f"Registry ID lookup + duplicate check: {per_lookup * 1e6:.2f} µs")
+
+    start = time.perf_counter()
+    for membership_id in wanted[-10:]:
+        any(x.Membership == membership_id for x in members)
+    per_scan = (time.perf_counter() - start) / 10
+    print(f"Linear duplicate check:               {per_scan * 1e6:,.0f} µs")
+
+    start = time.perf_counter()
+    registry.find_by_first_name("mohamed0")
+    print(f"First name lookup: {(time.perf_counter() - start) * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,206 @@
+import sys
+import time
+import random
+from collections import Counter
+
+END = ""  # trie key that marks "a whole name ends here"
+
+
+def _tokens(text):
+    return text.casefold().split()
+
+
+def _trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Prefix and typo-tolerant search over first and last names.
+
+    Every distinct name (case-folded) is stored once:
+    - ids:       name -> set of Membership IDs that have it
+    - tokens_of: Membership ID -> its names, to score multi-word queries
+    - trie:      nested dicts, one level per letter, for prefix lookups
+    - trigrams:  "moh" -> names containing it, for fuzzy matching
+
+    A million members share far fewer distinct names, so the trie and
+    trigram sets stay small; only `ids` and `tokens_of` grow with the roster.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.tokens_of = {}
+        self.trie = {}
+        self.trigrams = {}
+        self.gram_count = {}
+
+    def add(self, membership_id, *names):
+        tokens = tuple({token for name in names for token in _tokens(name)})
+        self.tokens_of[membership_id] = tokens
+        for token in tokens:
+            members = self.ids.get(token)
+            if members is None:
+                members = self.ids[token] = set()
+                self._add_token(token)
+            members.add(membership_id)
+
+    def remove(self, membership_id):
+        for token in self.tokens_of.pop(membership_id, ()):
+            members = self.ids.get(token)
+            if members is None:
+                continue
+            members.discard(membership_id)
+            if not members:
+                del self.ids[token]
+                self._remove_token(token)
+
+    def _add_token(self, token):
+        node = self.trie
+        for char in token:
+            node = node.setdefault(char, {})
+        node[END] = True
+        grams = _trigrams(token)
+        self.gram_count[token] = len(grams)
+        for gram in grams:
+            self.trigrams.setdefault(gram, set()).add(token)
+
+    def _remove_token(self, token):
+        path = [self.trie]
+        for char in token:
+            path.append(path[-1][char])
+        del path[-1][END]
+        # Prune branches that no longer lead to any name
+        for depth in range(len(token), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][token[depth - 1]]
+        del self.gram_count[token]
+        for gram in _trigrams(token):
+            names = self.trigrams[gram]
+            names.discard(token)
+            if not names:
+                del self.trigrams[gram]
+
+    # ====== Lookups ======
+    def prefix(self, prefix, limit=50):
+        """Up to `limit` distinct names starting with `prefix`, shortest first."""
+        node = self.trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        found = []
+        # Breadth-first, so "ali" comes before "alia" and "alibaba"
+        level = [(prefix, node)]
+        while level and len(found) < limit:
+            following = []
+            for text, current in level:
+                for char, child in current.items():
+                    if char == END:
+                        found.append(text)
+                    else:
+                        following.append((text + char, child))
+            level = following
+        return found[:limit]
+
+    def fuzzy(self, token, limit=50, min_score=0.3):
+        """Distinct names that share enough trigrams with `token`, best first."""
+        grams = _trigrams(token)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.trigrams.get(gram, ()))
+        scored = []
+        for name, common in shared.items():
+            score = common / (len(grams) + self.gram_count[name] - common)
+            if score >= min_score:
+                scored.append((score, name))
+        scored.sort(reverse=True)
+        return scored[:limit]
+
+    def _token_matches(self, token, enough):
+        """
+        {name: score} for one query word: exact 1.0, prefix 0.9, fuzzy below that.
+
+        The trigram lookup is the slow part, so it only runs when exact and
+        prefix matches cover fewer than `enough` members.
+        """
+        matches = {name: 0.9 for name in self.prefix(token)}
+        if token in self.ids:
+            matches[token] = 1.0
+        if sum(len(self.ids[name]) for name in matches) < enough:
+            for score, name in self.fuzzy(token):
+                matches.setdefault(name, score * 0.8)
+        return matches
+
+    def search(self, query, limit=20):
+        """
+        Ranked Membership IDs for a query like "moh", "mohamd tamer" or "tam".
+
+        Each query word is matched against names and a member must match
+        every word; it scores the sum of its best match per word.
+        """
+        words = _tokens(query)
+        if not words:
+            return []
+        if len(words) == 1:
+            per_word = [self._token_matches(words[0], limit)]
+            # Walk names from best to worst and stop once we have enough members;
+            # a member with two matching names keeps the first (best) score
+            results = {}
+            for name, score in sorted(per_word[0].items(), key=lambda item: -item[1]):
+                for membership_id in self.ids[name]:
+                    results.setdefault(membership_id, score)
+                    if len(results) == limit:
+                        return [(score, membership_id) for membership_id, score in results.items()]
+            return [(score, membership_id) for membership_id, score in results.items()]
+        # Fuzzy matches are always wanted here, the words narrow each other down
+        per_word = [self._token_matches(word, float("inf")) for word in words]
+        # Start from the word with the fewest members and check the others per member
+        sizes = [sum(len(self.ids[name]) for name in matches) for matches in per_word]
+        smallest = per_word.pop(sizes.index(min(sizes)))
+        best_of = {}
+        for name, first_score in smallest.items():
+            for membership_id in self.ids[name]:
+                tokens = self.tokens_of[membership_id]
+                total = first_score
+                for matches in per_word:
+                    best = max((matches.get(token, 0) for token in tokens), default=0)
+                    if not best:
+                        break
+                    total += best
+                else:
+                    # Several of the member's names can match the first word, keep the best
+                    if total > best_of.get(membership_id, 0):
+                        best_of[membership_id] = total
+        results = [(total, membership_id) for membership_id, total in best_of.items()]
+        results.sort(key=lambda item: -item[0])
+        return results[:limit]
+
+
+# ====== Benchmark ======
+def benchmark(count=1_000_000):
+    """Index `count` synthetic members and time a few typical searches."""
+    rng = random.Random(3)
+    syllables = ["mo", "ha", "med", "ah", "ma", "om", "ar", "sa", "ra", "yo", "us", "sef", "nour", "li", "ta", "mer"]
+    first_names = list({"".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(20_000)})
+    last_names = list({"".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(50_000)})
+
+    index = NameIndex()
+    start = time.perf_counter()
+    for i in range(count):
+        index.add(str(i), rng.choice(first_names), rng.choice(last_names))
+    print(f"Indexed {count:,} members ({len(index.ids):,} distinct names) in {time.perf_counter() - start:.1f}s")
+
+    name = first_names[0]
+    typo = name[:2] + name[3:] if len(name) > 3 else name + "x"
+    other = last_names[0]
+    for query in (name, name[:3], typo, f"{name} {other}", f"{typo} {other[:4]}"):
+        start = time.perf_counter()
+        results = index.search(query)
+        print(f"  {query!r:28} {len(results):3} results in {(time.perf_counter() - start) * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:2]))
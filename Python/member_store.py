@@ -0,0 +1,120 @@
+import os
+import sqlite3
+
+# ====== Files ======
+DB_FILE = "members.db"
+EXCEL_FILE = "members.xlsx"
+COLUMNS = ["First Name", "Last Name", "Membership ID", "Membership Status"]
+DATE_COLUMNS = ["Start Date", "Expiry Date"]
+
+# How many rows the startup loader pulls from SQLite at a time
+LOAD_CHUNK = 10_000
+
+
+class MemberStore:
+    """
+    Members saved in SQLite, one row per member.
+
+    Adding or deleting a member touches one row instead of rewriting a
+    whole workbook. Excel is only written when someone asks for an export.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        # WAL journal: an insert is a small append, readers never block the writer
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS members (
+                membership_id TEXT PRIMARY KEY,
+                first_name    TEXT NOT NULL,
+                last_name     TEXT NOT NULL,
+                status        TEXT NOT NULL,
+                start_date    TEXT,
+                expiry_date   TEXT
+            )""")
+        # Databases made before memberships had dates get the two new columns
+        known = {row[1] for row in self.conn.execute("PRAGMA table_info(members)")}
+        for column in ("start_date", "expiry_date"):
+            if column not in known:
+                self.conn.execute(f"ALTER TABLE members ADD COLUMN {column} TEXT")
+        # Indexes for sorted / filtered paging in member_view.py
+        self.conn.execute("CREATE INDEX IF NOT EXISTS members_first_name ON members (first_name)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS members_last_name ON members (last_name)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS members_status ON members (status COLLATE NOCASE)")
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM members").fetchone()[0]
+
+    def add(self, member):
+        self.add_many([member])
+
+    def add_many(self, members):
+        """Insert many members in one transaction, all or nothing."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO members (membership_id, first_name, last_name, status, start_date, expiry_date) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((m.Membership, m.FirstName, m.LastName, m.Status, m.StartDate, m.ExpiryDate) for m in members))
+
+    def set_status(self, membership_id, status):
+        with self.conn:
+            self.conn.execute("UPDATE members SET status = ? WHERE membership_id = ?", (status, membership_id))
+
+    def delete(self, membership_id):
+        """Delete one member, returns True if it was there."""
+        with self.conn:
+            return self.conn.execute("DELETE FROM members WHERE membership_id = ?", (membership_id,)).rowcount > 0
+
+    def rows(self):
+        """Yield (first name, last name, ID, status, start date, expiry date) rows straight from the cursor."""
+        yield from self.conn.execute(
+            "SELECT first_name, last_name, membership_id, status, start_date, expiry_date "
+            "FROM members ORDER BY rowid")
+
+    def iter_chunks(self, size=LOAD_CHUNK):
+        """Yield lists of at most `size` rows, so loading never holds two copies of the roster."""
+        cursor = self.conn.execute(
+            "SELECT first_name, last_name, membership_id, status, start_date, expiry_date "
+            "FROM members ORDER BY rowid")
+        while True:
+            chunk = cursor.fetchmany(size)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        self.conn.close()
+
+    # ====== Excel ======
+    def export_excel(self, path=EXCEL_FILE):
+        """Stream every member into a new workbook, returns how many were written."""
+        from openpyxl import Workbook
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Members")
+        sheet.append(COLUMNS + DATE_COLUMNS)
+        count = 0
+        for row in self.rows():
+            sheet.append(row)
+            count += 1
+        tmp_path = path + ".tmp"
+        workbook.save(tmp_path)
+        os.replace(tmp_path, path)
+        return count
+
+    def import_excel(self, path=EXCEL_FILE):
+        """Copy members from an old members.xlsx in one transaction, skipping known IDs."""
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True)
+        rows = workbook.active.iter_rows(min_row=2, values_only=True)
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO members (membership_id, first_name, last_name, status) VALUES (?, ?, ?, ?)",
+                ((str(member_id), first or "", last or "", status or "inactive")
+                 for first, last, member_id, status in ((tuple(row) + (None,) * 4)[:4] for row in rows) if member_id is not None))
+            added = self.conn.total_changes - before
+        workbook.close()
+        return added
@@ -0,0 +1,98 @@
+from itertools import islice
+from tabulate import tabulate
+from member_store import COLUMNS
+
+PAGE_SIZE = 20
+
+# Sort keys the user can type -> indexed columns in members.db
+SORT_COLUMNS = {"first": "first_name", "last": "last_name", "id": "membership_id",
+                "status": "status COLLATE NOCASE"}
+
+
+# ====== Page Sources ======
+# Both sources yield one page (a list of rows) at a time and only do the
+# work for the page being asked for, so the first page shows up just as
+# fast with ten members as with a million.
+
+def registry_pages(registry, page_size=PAGE_SIZE, status=None):
+    """Pages from the in-memory registry in the order members were added."""
+    if status:
+        members = iter(registry.by_status.get(status.casefold(), {}).values())
+    else:
+        members = iter(registry)
+    while True:
+        page = [[m.FirstName, m.LastName, m.Membership, m.Status] for m in islice(members, page_size)]
+        if not page:
+            return
+        yield page
+
+
+def store_pages(store, page_size=PAGE_SIZE, status=None, sort_by=None):
+    """
+    Pages straight from members.db.
+
+    Uses keyset paging (WHERE (column, rowid) > last seen row) over an
+    indexed column instead of OFFSET, so page 1000 costs the same as page 1.
+    """
+    column = SORT_COLUMNS.get(sort_by, "rowid")
+    # With a sort key, "+status" tells SQLite to walk the sort index and filter
+    # as it goes, instead of collecting every matching status and sorting them
+    skip_status_index = sort_by in SORT_COLUMNS and sort_by != "status"
+    where = f"WHERE {'+' if skip_status_index else ''}status = ? COLLATE NOCASE" if status else ""
+    params = [status] if status else []
+    last = None
+    while True:
+        if last is None:
+            condition = where
+            page_params = params
+        else:
+            condition = (where + " AND" if where else "WHERE") + f" ({column}, rowid) > (?, ?)"
+            page_params = params + list(last)
+        rows = store.conn.execute(
+            f"SELECT first_name, last_name, membership_id, status, {column}, rowid FROM members "
+            f"{condition} ORDER BY {column}, rowid LIMIT ?", page_params + [page_size]).fetchall()
+        if not rows:
+            return
+        last = rows[-1][4:]
+        yield [list(row[:4]) for row in rows]
+
+
+# ====== Viewer ======
+def render_page(rows, number):
+    return f"Page {number}\n" + tabulate(rows, headers=COLUMNS, tablefmt="grid")
+
+
+def view_pages(pages, clear=None):
+    """
+    Show pages one at a time: Enter / n = next, p = previous, q = quit.
+
+    Only the pages already seen are kept, so going back is instant and
+    nothing past the current page is ever read.
+    """
+    seen = []
+    current = 0
+    while True:
+        notice = ""
+        if current == len(seen):
+            page = next(pages, None)
+            if page is None:
+                if not seen:
+                    print("No members to display.")
+                    input("Press Enter to Exit....")
+                    return
+                current -= 1
+                notice = "That was the last page."
+            else:
+                seen.append(page)
+        if clear:
+            clear()
+        print(render_page(seen[current], current + 1))
+        if notice:
+            print(notice)
+        action = input("[Enter/n] next  [p] previous  [q] quit: ").strip().lower()
+        if action == "q":
+            return
+        if action == "p":
+            current = max(0, current - 1)
+        else:
+            current += 1
@@ -1,4 +1,4 @@
-import random
+import secrets
 import string
 
 # Function to generate a strong password
@@ -7,7 +7,7 @@ x=int(input("Enter The Length The Password? "))
 def generate_strong_password(length=x):
 
     characters = string.ascii_letters + string.digits + string.punctuation
-    password = ''.join(random.choice(characters) for i in range(length))
+    password = ''.join(secrets.choice(characters) for i in range(length))
     return password
 
 # Generate a strong password of length 16
@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import time
+import tempfile
+
+# Fold the log into the snapshot once it holds this many operations, or a
+# quarter as many as there are tasks if that is more. A big list is then
+# rewritten only every len(tasks) / 4 changes, so each change stays O(1)
+# on average and the log stays short enough to replay quickly.
+SNAPSHOT_EVERY = 1000
+
+
+def write_atomic(path, text):
+    """Write to a temp file next to `path`, then rename it over `path`."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+class TaskLog:
+    """
+    Saves tasks as a snapshot plus a log of the changes made since.
+
+    - tasks.json      snapshot: {"seq": n, "tasks": [...]} (older files are a bare list)
+    - tasks.json.log  one JSON operation per line, e.g. {"op": "add", "task": {...}, "seq": 7}
+
+    Every change is one small append instead of rewriting the whole list.
+    Every so often (see SNAPSHOT_EVERY) the log is folded into a new snapshot.
+    """
+
+    def __init__(self, path, sync=True):
+        self.path = path
+        self.log_path = path + ".log"
+        self.sync = sync
+        self.seq = 0
+        self.pending = 0
+        self.file = None
+
+    def load(self):
+        """Return (tasks from the snapshot, operations logged after it)."""
+        tasks = []
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as file:
+                content = json.load(file)
+            if isinstance(content, list):
+                tasks = content
+            else:
+                tasks, self.seq = content["tasks"], content["seq"]
+        ops = []
+        if os.path.exists(self.log_path):
+            good_end = 0
+            with open(self.log_path, "rb") as file:
+                for line in file:
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        # Torn last line from a crash mid-write, drop it
+                        break
+                    good_end += len(line)
+                    if op["seq"] > self.seq:
+                        ops.append(op)
+                        self.seq = op["seq"]
+            if good_end != os.path.getsize(self.log_path):
+                os.truncate(self.log_path, good_end)
+        self.pending = len(ops)
+        return tasks, ops
+
+    def append(self, op):
+        """Log one operation, O(1) no matter how many tasks there are."""
+        self.append_many([op])
+
+    def append_many(self, ops):
+        """Log several operations with a single write (and fsync)."""
+        lines = []
+        for op in ops:
+            self.seq += 1
+            lines.append(json.dumps(dict(op, seq=self.seq)) + "\n")
+        if self.file is None:
+            self.file = open(self.log_path, "a", encoding="utf-8")
+        self.file.write("".join(lines))
+        self.file.flush()
+        if self.sync:
+            os.fsync(self.file.fileno())
+        self.pending += len(ops)
+
+    def fsync(self):
+        """Force appended operations to disk, for callers that batch with sync=False."""
+        if self.file is not None:
+            os.fsync(self.file.fileno())
+
+    def needs_compact(self, count):
+        """True once the log is long enough to fold into a snapshot of `count` tasks."""
+        return self.pending >= max(SNAPSHOT_EVERY, count // 4)
+
+    def maybe_compact(self, tasks):
+        if self.needs_compact(len(tasks)):
+            self.compact(tasks)
+
+    def compact(self, tasks):
+        """Write every task to a new snapshot and empty the log."""
+        write_atomic(self.path, json.dumps({"seq": self.seq, "tasks": tasks}, separators=(",", ":")))
+        # If we crash before this, the logged ops are skipped on load thanks to "seq"
+        if os.path.exists(self.log_path):
+            os.truncate(self.log_path, 0)
+        self.pending = 0
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def apply_op(tasks, op):
+    """Replay one logged operation on the task list."""
+    if op["op"] == "add":
+        tasks.append(op["task"])
+    elif op["op"] == "complete":
+        tasks[op["index"]]["Complete"] = True
+    elif op["op"] == "delete":
+        del tasks[op["index"]]
+
+
+def load_tasks(log):
+    """Snapshot plus replayed log, replaces reading the whole tasks.json every time."""
+    tasks, ops = log.load()
+    for op in ops:
+        apply_op(tasks, op)
+    return tasks
+
+
+# ====== Benchmark ======
+def benchmark(count=100_000):
+    """Add `count` tasks one by one, then time a cold load."""
+    folder = tempfile.mkdtemp(prefix="task_log_")
+    path = os.path.join(folder, "tasks.json")
+    log = TaskLog(path, sync=False)
+    tasks = load_tasks(log)
+    start = time.perf_counter()
+    for i in range(count):
+        task = {"Task": f"Task number {i}", "Complete": False}
+        tasks.append(task)
+        log.append({"op": "add", "task": task})
+        log.maybe_compact(tasks)
+    print(f"Added {count:,} tasks in {time.perf_counter() - start:.2f}s")
+    log.close()
+    start = time.perf_counter()
+    loaded = load_tasks(TaskLog(path))
+    print(f"Loaded {len(loaded):,} tasks in {(time.perf_counter() - start) * 1000:.0f} ms")
+    for name in os.listdir(folder):
+        os.remove(os.path.join(folder, name))
+    os.rmdir(folder)
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+import heapq
+import random
+import calendar
+import tempfile
+from datetime import date, timedelta
+
+# Lower rank comes first when two tasks are due on the same day
+PRIORITIES = {"high": 1, "medium": 2, "low": 3}
+DEFAULT_PRIORITY = "medium"
+REPEATS = ("daily", "weekly", "monthly")
+
+# Sorts after every real "YYYY-MM-DD", so undated tasks come last
+NO_DUE = "9999-12-31"
+
+
+def next_due(due, repeat, month_day=None):
+    """
+    The "YYYY-MM-DD" of the occurrence after `due` for a repeating task.
+
+    For monthly tasks `month_day` is the day of the month it was first due,
+    so a task due on the 31st goes 01-31, 02-28, 03-31 instead of sticking
+    to the 28th after February.
+    """
+    day = date.fromisoformat(due)
+    if repeat == "daily":
+        day += timedelta(days=1)
+    elif repeat == "weekly":
+        day += timedelta(days=7)
+    elif repeat == "monthly":
+        # Jan 31 -> Feb 28/29, the day is clamped to the length of the month
+        year, month = (day.year + 1, 1) if day.month == 12 else (day.year, day.month + 1)
+        wanted = month_day or day.day
+        day = day.replace(year=year, month=month, day=min(wanted, calendar.monthrange(year, month)[1]))
+    return day.isoformat()
+
+
+class TaskScheduler:
+    """
+    Min-heap of (due date, priority rank, task ID) over the incomplete tasks.
+
+    "What's next" looks at the top of the heap, and "overdue" / "due this
+    week" pop only the entries inside the window, O(k log n) for k results.
+    A repeating task has a single entry for its next occurrence; completing
+    it moves its due date on and schedule() pushes the new one, so future
+    occurrences are never generated up front.
+    Completed, deleted or rescheduled tasks leave stale entries behind;
+    those are skipped when they reach the top (lazy deletion).
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.heap = [self._entry(task) for task in store.incomplete_tasks()]
+        heapq.heapify(self.heap)
+
+    def _entry(self, task):
+        return (task["Due"] or NO_DUE, PRIORITIES[task["Priority"]], task["id"])
+
+    def schedule(self, task):
+        """Push a task that was added, or whose due date or priority changed."""
+        if not task["Complete"]:
+            heapq.heappush(self.heap, self._entry(task))
+
+    def _is_current(self, entry):
+        task = self.store.get(entry[2])
+        return task is not None and not task["Complete"] and self._entry(task) == entry
+
+    def _drop_stale(self):
+        while self.heap and not self._is_current(self.heap[0]):
+            heapq.heappop(self.heap)
+
+    def _take_until(self, limit):
+        """Current tasks due on or before `limit`, soonest and most important first."""
+        taken = []
+        found = []
+        while self.heap and self.heap[0][0] <= limit:
+            entry = heapq.heappop(self.heap)
+            if self._is_current(entry):
+                taken.append(entry)
+                found.append(self.store.get(entry[2]))
+        for entry in taken:
+            heapq.heappush(self.heap, entry)
+        return found
+
+    # ====== Queries ======
+    def next_task(self):
+        """The task to do next, or None when nothing is left."""
+        self._drop_stale()
+        return self.store.get(self.heap[0][2]) if self.heap else None
+
+    def overdue(self, today=None):
+        """Incomplete tasks whose due date has passed."""
+        today = today or date.today()
+        return self._take_until((today - timedelta(days=1)).isoformat())
+
+    def due_within(self, days=7, today=None):
+        """Incomplete tasks due from today up to `days` days ahead (not overdue ones)."""
+        today = today or date.today()
+        found = self._take_until((today + timedelta(days=days - 1)).isoformat())
+        return [task for task in found if task["Due"] >= today.isoformat()]
+
+
+# ====== Benchmark ======
+def benchmark(count=200_000):
+    """Schedule `count` tasks and time the queries against a full sort."""
+    from task_store import TaskStore
+
+    folder = tempfile.mkdtemp(prefix="task_schedule_")
+    store = TaskStore(os.path.join(folder, "tasks.json"), sync=False)
+    rng = random.Random(5)
+    today = date(2025, 6, 1)
+    for i in range(count):
+        due = (today + timedelta(days=rng.randint(-3, 365))).isoformat()
+        store.add(f"Task number {i}", due=due, priority=rng.choice(list(PRIORITIES)))
+    start = time.perf_counter()
+    scheduler = TaskScheduler(store)
+    print(f"Built a heap of {count:,} tasks in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def timed(label, run):
+        start = time.perf_counter()
+        result = run()
+        print(f"  {label:30} {(time.perf_counter() - start) * 1000:8.2f} ms")
+        return result
+
+    timed("next task", scheduler.next_task)
+    timed("overdue", lambda: scheduler.overdue(today))
+    timed("due this week", lambda: scheduler.due_within(7, today))
+    timed("complete next + next task", lambda: (store.complete(scheduler.next_task()["id"]), scheduler.next_task()))
+    timed("sort everything (old way)", lambda: sorted(store.incomplete_tasks(), key=lambda task: task["Due"]))
+    store.close()
+    for name in os.listdir(folder):
+        os.remove(os.path.join(folder, name))
+    os.rmdir(folder)
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:2]))
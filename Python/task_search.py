@@ -0,0 +1,164 @@
+import re
+import sys
+import time
+import random
+from bisect import bisect_left, insort
+
+WORD = re.compile(r"\w+")
+
+
+def _tokens(text):
+    return WORD.findall(text.casefold())
+
+
+class TaskIndex:
+    """
+    Inverted index over task titles and notes.
+
+    - postings:  word -> set of task IDs that contain it
+    - tokens_of: task ID -> its distinct words, so remove() only touches those
+    - vocab:     every distinct word, kept sorted for prefix queries ("rep*")
+
+    Adding, editing or deleting a task updates only the words of that task.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.tokens_of = {}
+        self.vocab = []
+
+    def add(self, task_id, *texts):
+        tokens = {token for text in texts if text for token in _tokens(text)}
+        self.tokens_of[task_id] = tokens
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                insort(self.vocab, token)
+            ids.add(task_id)
+
+    def remove(self, task_id):
+        for token in self.tokens_of.pop(task_id, ()):
+            ids = self.postings[token]
+            ids.discard(task_id)
+            if not ids:
+                del self.postings[token]
+                del self.vocab[bisect_left(self.vocab, token)]
+
+    def update(self, task_id, *texts):
+        self.remove(task_id)
+        self.add(task_id, *texts)
+
+    # ====== Queries ======
+    def _word(self, word, prefix=False):
+        """Task IDs for one indexed word, or for every word starting with it."""
+        if not prefix:
+            return self.postings.get(word, set())
+        found = set()
+        for i in range(bisect_left(self.vocab, word), len(self.vocab)):
+            if not self.vocab[i].startswith(word):
+                break
+            found |= self.postings[self.vocab[i]]
+        return found
+
+    def _term(self, term):
+        """
+        Task IDs for one query word, split the same way titles are: "e-mail"
+        must contain both "e" and "mail", "bob," is just "bob". A trailing
+        "*" makes the last piece a prefix. None if nothing is left to match.
+        """
+        prefix = term.endswith("*")
+        pieces = _tokens(term)
+        if not pieces:
+            return None
+        sets = [self._word(piece) for piece in pieces[:-1]] + [self._word(pieces[-1], prefix)]
+        sets.sort(key=len)
+        found = set(sets[0])
+        for ids in sets[1:]:
+            found &= ids
+        return found
+
+    def _group(self, terms):
+        """IDs matching every plain term and none of the "-term" / "NOT term" ones."""
+        wanted = []
+        unwanted = []
+        negate = False
+        for term in terms:
+            if term == "NOT":
+                negate = True
+                continue
+            if term.startswith("-") and len(term) > 1:
+                negate, term = True, term[1:]
+            ids = self._term(term)
+            if ids is not None:
+                (unwanted if negate else wanted).append(ids)
+            negate = False
+        if not wanted and not unwanted:
+            # Only punctuation, nothing to search for
+            return set()
+        if wanted:
+            # Intersect from the rarest word up, so the work shrinks at every step
+            wanted.sort(key=len)
+            result = set(wanted[0])
+            for ids in wanted[1:]:
+                result &= ids
+                if not result:
+                    return result
+        else:
+            result = set(self.tokens_of)
+        for ids in unwanted:
+            result -= ids
+        return result
+
+    def search(self, query, limit=None):
+        """
+        Task IDs for a query such as "report", "rep*", "milk OR bread" or
+        "work -meeting", oldest task first.
+
+        Words are ANDed, OR separates alternatives, and a word after NOT or
+        with a leading "-" must not appear. OR and NOT must be in capitals,
+        so "or" and "not" can still be searched for.
+        """
+        groups = [[]]
+        for term in query.split():
+            if term == "OR":
+                groups.append([])
+            else:
+                groups[-1].append(term)
+        result = set()
+        for group in groups:
+            if group:
+                result |= self._group(group)
+        return sorted(result)[:limit]
+
+
+# ====== Benchmark ======
+def benchmark(count=1_000_000):
+    """Index `count` synthetic tasks and time a few typical queries."""
+    rng = random.Random(11)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = list({"".join(rng.choice(letters) for _ in range(rng.randint(3, 8))) for _ in range(50_000)})
+    common = ["buy", "call", "email", "fix", "report", "meeting", "pay", "clean", "book", "review"]
+
+    index = TaskIndex()
+    start = time.perf_counter()
+    for task_id in range(count):
+        title = " ".join([rng.choice(common)] + rng.sample(words, 3))
+        notes = " ".join(rng.sample(words, 5)) if task_id % 3 == 0 else ""
+        index.add(task_id, title, notes)
+    print(f"Indexed {count:,} tasks ({len(index.vocab):,} distinct words) in {time.perf_counter() - start:.1f}s")
+
+    rare = words[0]
+    for query in (rare, f"{rare[:3]}*", f"report {rare}", f"{rare} OR {words[1]}", f"{rare[:2]}* -report",
+                  "report meeting"):
+        start = time.perf_counter()
+        results = index.search(query)
+        print(f"  {query!r:28} {len(results):7,} results in {(time.perf_counter() - start) * 1000:8.2f} ms")
+    start = time.perf_counter()
+    index.update(0, "edited title", "new notes")
+    index.remove(1)
+    print(f"  edit + delete one task      {(time.perf_counter() - start) * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,344 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import tempfile
+from datetime import date
+from collections import deque
+from urllib.parse import urlsplit, parse_qs
+from task_store import TaskStore, TASKS_FILE
+from task_schedule import PRIORITIES, DEFAULT_PRIORITY, REPEATS
+
+# ====== Settings ======
+HOST = "127.0.0.1"
+PORT = 8077
+
+# Bodies bigger than this are refused, a task is a few hundred bytes
+MAX_BODY = 1024 * 1024
+# Latencies kept per route for /metrics, older ones are dropped
+METRIC_SAMPLES = 10_000
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def percentile(samples, fraction):
+    """The value below which `fraction` of the samples fall (0.99 for p99)."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+# ====== Server ======
+class TaskServer:
+    """
+    Serves one TaskStore to many clients over HTTP/1.1 with JSON bodies.
+
+        GET    /tasks?state=incomplete&tag=work&due=2025-06-01
+        POST   /tasks                  {"Task": "...", "Notes": "...", "Tags": [...], "Due": "...", ...}
+        GET    /tasks/<id>
+        PATCH  /tasks/<id>             {"Task": "...", "Notes": "..."}
+        DELETE /tasks/<id>
+        POST   /tasks/<id>/complete
+        GET    /search?q=milk+OR+bread
+        GET    /metrics                count, p50 and p99 latency per route
+
+    Connections are kept open between requests. Changes go to the log
+    straight away, but the fsync is shared: while one fsync runs, new
+    changes queue up and the next fsync covers them all (group commit).
+    A write is only answered once its fsync is done.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.waiters = []
+        self.dirty = asyncio.Event()
+        self.latencies = {}
+
+    # ====== Group Commit ======
+    async def commit(self):
+        """Wait until every change made so far is safely on disk."""
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.dirty.set()
+        await waiter
+
+    async def flush_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.dirty.wait()
+            self.dirty.clear()
+            waiters, self.waiters = self.waiters, []
+            try:
+                await loop.run_in_executor(None, self.store.log.fsync)
+            except OSError as error:
+                for waiter in waiters:
+                    waiter.set_exception(error)
+                continue
+            for waiter in waiters:
+                waiter.set_result(None)
+
+    # ====== Routes ======
+    def _body(self, body, required=(), allowed=None):
+        """
+        Parse and check a task body before anything touches the store, the
+        same checks Add_Task in to-do-list.py makes. Bad input is a 400,
+        and so are fields outside `allowed` when it is given.
+        """
+        data = json.loads(body)
+        if not isinstance(data, dict):
+            raise HTTPError(400, "body must be a JSON object")
+        if allowed is not None:
+            ignored = [field for field in data if field not in allowed]
+            if ignored:
+                raise HTTPError(400, f"can't change {', '.join(ignored)} here, only {', '.join(allowed)}")
+        for field in required:
+            if field not in data:
+                raise HTTPError(400, f"{field} is required")
+        for field in ("Task", "Notes"):
+            if field in data and not isinstance(data[field], str):
+                raise HTTPError(400, f"{field} must be a string")
+        tags = data.get("Tags", [])
+        if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+            raise HTTPError(400, "Tags must be a list of strings")
+        due = data.get("Due")
+        if due is not None:
+            try:
+                date.fromisoformat(due)
+            except (TypeError, ValueError):
+                raise HTTPError(400, "Due must be a YYYY-MM-DD date")
+        if data.get("Priority", DEFAULT_PRIORITY) not in PRIORITIES:
+            raise HTTPError(400, f"Priority must be one of {', '.join(PRIORITIES)}")
+        repeat = data.get("Repeat")
+        if repeat is not None and (repeat not in REPEATS or due is None):
+            raise HTTPError(400, f"Repeat must be one of {', '.join(REPEATS)} and needs a Due date")
+        return data
+
+    def _task(self, task_id):
+        task = self.store.get(int(task_id))
+        if task is None:
+            raise HTTPError(404, f"no task {task_id}")
+        return task
+
+    async def route(self, method, path, query, body):
+        """Return (status, route name for metrics, JSON payload)."""
+        parts = path.strip("/").split("/")
+        if parts == ["tasks"]:
+            if method == "GET":
+                return 200, "GET /tasks", self.list_tasks(query)
+            if method == "POST":
+                data = self._body(body, required=("Task",))
+                task = self.store.add(data["Task"], data.get("Tags", ()), data.get("Due"),
+                                      data.get("Priority", DEFAULT_PRIORITY), data.get("Repeat"),
+                                      data.get("Notes", ""))
+                await self.commit()
+                return 201, "POST /tasks", task
+        elif len(parts) == 2 and parts[0] == "tasks":
+            task = self._task(parts[1])
+            if method == "GET":
+                return 200, "GET /tasks/{id}", task
+            if method == "PATCH":
+                data = self._body(body, allowed=("Task", "Notes"))
+                self.store.edit(task["id"], data.get("Task"), data.get("Notes"))
+                await self.commit()
+                return 200, "PATCH /tasks/{id}", task
+            if method == "DELETE":
+                self.store.delete(task["id"])
+                await self.commit()
+                return 200, "DELETE /tasks/{id}", task
+        elif len(parts) == 3 and parts[0] == "tasks" and parts[2] == "complete":
+            task = self._task(parts[1])
+            if method == "POST":
+                self.store.complete(task["id"])
+                await self.commit()
+                return 200, "POST /tasks/{id}/complete", task
+        elif parts == ["search"] and method == "GET":
+            limit = int(query.get("limit", ["100"])[0])
+            return 200, "GET /search", self.store.search(query.get("q", [""])[0], limit)
+        elif parts == ["metrics"] and method == "GET":
+            return 200, "GET /metrics", self.metrics()
+        else:
+            raise HTTPError(404, f"no route {path}")
+        raise HTTPError(405, f"{method} not allowed on {path}")
+
+    def list_tasks(self, query):
+        state = query.get("state", [""])[0]
+        if "tag" in query:
+            tasks = self.store.with_tag(query["tag"][0])
+        elif "due" in query:
+            tasks = self.store.due_on(query["due"][0])
+        elif state == "incomplete":
+            return self.store.incomplete_tasks()
+        elif state == "complete":
+            return self.store.completed_tasks()
+        else:
+            return list(self.store)
+        if state:
+            tasks = [task for task in tasks if task["Complete"] == (state == "complete")]
+        return tasks
+
+    def metrics(self):
+        return {name: {"count": len(samples),
+                       "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+                       "p99_ms": round(percentile(samples, 0.99) * 1000, 3)}
+                for name, samples in self.latencies.items()}
+
+    # ====== HTTP ======
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                start = time.perf_counter()
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                length = int(headers.get("content-length", 0))
+                name = "other"
+                try:
+                    if length > MAX_BODY:
+                        keep_alive = False
+                        raise HTTPError(413, "body too large")
+                    body = await reader.readexactly(length) if length else b""
+                    url = urlsplit(target)
+                    status, name, payload = await self.route(method, url.path, parse_qs(url.query), body)
+                except HTTPError as error:
+                    status, payload = error.status, {"error": str(error)}
+                except (ValueError, KeyError, TypeError, AttributeError) as error:
+                    status, payload = 400, {"error": f"bad request: {error}"}
+                except OSError as error:
+                    status, payload = 500, {"error": f"could not save: {error}"}
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                samples = self.latencies.get(name)
+                if samples is None:
+                    samples = self.latencies[name] = deque(maxlen=METRIC_SAMPLES)
+                samples.append(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=HOST, port=PORT):
+        self.flusher = asyncio.create_task(self.flush_loop())
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+def serve(path=TASKS_FILE, host=HOST, port=PORT):
+    """Run the server until Ctrl+C."""
+    # fsync is done by the group commit, not on every append
+    store = TaskStore(path, sync=False)
+
+    async def main():
+        server = await TaskServer(store).start(host, port)
+        print(f"To-do server listening on http://{host}:{port} (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("To-do server stopped.")
+    finally:
+        store.close()
+
+
+# ====== Load Generator ======
+async def _call(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                 + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _client(port, count, latencies, rng):
+    """One keep-alive connection sending a mix of reads and writes."""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    mine = []
+    for i in range(count):
+        roll = rng.random()
+        start = time.perf_counter()
+        if roll < 0.2 or not mine:
+            status, task = await _call(reader, writer, "POST", "/tasks", {"Task": f"load test task {i}"})
+            mine.append(task["id"])
+        elif roll < 0.3:
+            status, _ = await _call(reader, writer, "POST", f"/tasks/{mine.pop()}/complete")
+        elif roll < 0.5:
+            status, _ = await _call(reader, writer, "GET", "/search?q=load+task&limit=10")
+        else:
+            status, _ = await _call(reader, writer, "GET", f"/tasks/{rng.choice(mine)}")
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+def load_test(clients=50, requests=200, sync=True):
+    """Run the server and `clients` keep-alive clients in one process, report req/s and latency."""
+    folder = tempfile.mkdtemp(prefix="task_server_")
+    store = TaskStore(os.path.join(folder, "tasks.json"), sync=False)
+    rng = random.Random(9)
+
+    async def main():
+        task_server = TaskServer(store)
+        if not sync:
+            # Skip the disk flush to see how fast the server itself is
+            task_server.commit = lambda: asyncio.sleep(0)
+        server = await task_server.start(HOST, 0)
+        port = server.sockets[0].getsockname()[1]
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(_client(port, requests, latencies, random.Random(rng.random()))
+                               for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+        server.close()
+        await server.wait_closed()
+        task_server.flusher.cancel()
+        total = clients * requests
+        print(f"{total:,} requests from {clients} clients in {elapsed:.2f}s: {total / elapsed:,.0f} req/s, "
+              f"p50 {percentile(latencies, 0.50) * 1000:.2f} ms, p99 {percentile(latencies, 0.99) * 1000:.2f} ms"
+              f"{'' if sync else ' (no fsync)'}")
+        for name, stats in sorted(task_server.metrics().items()):
+            print(f"  {name:28} {stats['count']:7,}  p50 {stats['p50_ms']:7.3f} ms  p99 {stats['p99_ms']:7.3f} ms")
+
+    asyncio.run(main())
+    store.close()
+    for name in os.listdir(folder):
+        os.remove(os.path.join(folder, name))
+    os.rmdir(folder)
+
+
+if __name__ == "__main__":
+    # Usage: python task_server.py [port]   |   python task_server.py bench [clients] [requests]
+    if sys.argv[1:2] == ["bench"]:
+        load_test(*(int(arg) for arg in sys.argv[2:4]))
+    else:
+        serve(port=int(sys.argv[1]) if len(sys.argv) > 1 else PORT)
@@ -0,0 +1,185 @@
+from task_log import TaskLog
+from task_schedule import DEFAULT_PRIORITY, next_due
+from task_search import TaskIndex
+
+TASKS_FILE = "tasks.json"
+
+
+class TaskStore:
+    """
+    To-do tasks addressed by a stable ID instead of their place in a list.
+
+    - tasks:      ID -> task dict {"id", "Task", "Notes", "Complete", "Tags", "Due", "Priority", "Repeat",
+                  "RepeatDay"}, RepeatDay being the day of the month a monthly task belongs on
+    - incomplete: ID -> None, and completed likewise (dicts as ordered sets)
+    - by_tag:     tag -> {ID: None}
+    - by_due:     "YYYY-MM-DD" -> {ID: None}
+    - words:      TaskIndex over titles and notes for search()
+
+    Every change is appended to the TaskLog, so saving never rewrites the
+    whole list.
+    """
+
+    def __init__(self, path=TASKS_FILE, sync=True):
+        self.log = TaskLog(path, sync)
+        self.tasks = {}
+        self.incomplete = {}
+        self.completed = {}
+        self.by_tag = {}
+        self.by_due = {}
+        self.words = TaskIndex()
+        self.next_id = 1
+        self._load()
+
+    def _load(self):
+        tasks, ops = self.log.load()
+        for task in tasks:
+            self._insert(task)
+        for op in ops:
+            self._apply(op)
+
+    def _apply(self, op):
+        if op["op"] == "add":
+            self._insert(op["task"])
+            return
+        if "index" in op:
+            # Written before tasks had IDs, the index was a position in the list
+            task_id = list(self.tasks)[op["index"]]
+        else:
+            task_id = op["id"]
+        if op["op"] == "complete":
+            self._complete(task_id)
+        elif op["op"] == "edit":
+            self._edit(task_id, op["Task"], op["Notes"])
+        elif op["op"] == "delete":
+            self._remove(task_id)
+
+    # ====== Index Upkeep ======
+    def _insert(self, task):
+        # Tasks saved before IDs existed get one in the order they were added
+        if "id" not in task:
+            task["id"] = self.next_id
+        task.setdefault("Tags", [])
+        task.setdefault("Due", None)
+        task.setdefault("Notes", "")
+        task.setdefault("Priority", DEFAULT_PRIORITY)
+        task.setdefault("Repeat", None)
+        task.setdefault("RepeatDay", None)
+        task_id = task["id"]
+        self.next_id = max(self.next_id, task_id + 1)
+        self.tasks[task_id] = task
+        (self.completed if task["Complete"] else self.incomplete)[task_id] = None
+        for tag in task["Tags"]:
+            self.by_tag.setdefault(tag, {})[task_id] = None
+        if task["Due"]:
+            self.by_due.setdefault(task["Due"], {})[task_id] = None
+        self.words.add(task_id, task["Task"], task["Notes"])
+
+    def _complete(self, task_id):
+        task = self.tasks[task_id]
+        if task["Repeat"] and task["Due"]:
+            # A repeating task stays open and moves on to its next occurrence
+            self._unindex(self.by_due, task["Due"], task_id)
+            task["Due"] = next_due(task["Due"], task["Repeat"], task["RepeatDay"])
+            self.by_due.setdefault(task["Due"], {})[task_id] = None
+            return
+        task["Complete"] = True
+        self.incomplete.pop(task_id, None)
+        self.completed[task_id] = None
+
+    def _edit(self, task_id, title, notes):
+        task = self.tasks[task_id]
+        task["Task"], task["Notes"] = title, notes
+        self.words.update(task_id, title, notes)
+
+    def _remove(self, task_id):
+        task = self.tasks.pop(task_id)
+        self.incomplete.pop(task_id, None)
+        self.completed.pop(task_id, None)
+        for tag in task["Tags"]:
+            self._unindex(self.by_tag, tag, task_id)
+        if task["Due"]:
+            self._unindex(self.by_due, task["Due"], task_id)
+        self.words.remove(task_id)
+        return task
+
+    def _unindex(self, index, key, task_id):
+        bucket = index[key]
+        del bucket[task_id]
+        if not bucket:
+            del index[key]
+
+    def _save(self, op):
+        self.log.append(op)
+        if self.log.needs_compact(len(self.tasks)):
+            self.log.compact(list(self.tasks.values()))
+
+    # ====== Public API ======
+    def __len__(self):
+        return len(self.tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self.tasks
+
+    def __iter__(self):
+        return iter(self.tasks.values())
+
+    def get(self, task_id):
+        return self.tasks.get(task_id)
+
+    def add(self, title, tags=(), due=None, priority=DEFAULT_PRIORITY, repeat=None, notes=""):
+        task = {"id": self.next_id, "Task": title, "Notes": notes, "Complete": False, "Tags": list(tags),
+                "Due": due, "Priority": priority, "Repeat": repeat,
+                "RepeatDay": int(due[8:10]) if due and repeat == "monthly" else None}
+        self._insert(task)
+        self._save({"op": "add", "task": task})
+        return task
+
+    def complete(self, task_id):
+        """
+        Mark a task complete, returns False if there is no such task.
+        A repeating task is moved on to its next due date instead.
+        """
+        if task_id not in self.tasks:
+            return False
+        self._complete(task_id)
+        self._save({"op": "complete", "id": task_id})
+        return True
+
+    def edit(self, task_id, title=None, notes=None):
+        """Change a task's title and/or notes, returns False if there is no such task."""
+        task = self.tasks.get(task_id)
+        if task is None:
+            return False
+        title = task["Task"] if title is None else title
+        notes = task["Notes"] if notes is None else notes
+        self._edit(task_id, title, notes)
+        self._save({"op": "edit", "id": task_id, "Task": title, "Notes": notes})
+        return True
+
+    def delete(self, task_id):
+        """Delete a task, returns it or None if there is no such task."""
+        if task_id not in self.tasks:
+            return None
+        task = self._remove(task_id)
+        self._save({"op": "delete", "id": task_id})
+        return task
+
+    def incomplete_tasks(self):
+        return [self.tasks[task_id] for task_id in self.incomplete]
+
+    def completed_tasks(self):
+        return [self.tasks[task_id] for task_id in self.completed]
+
+    def with_tag(self, tag):
+        return [self.tasks[task_id] for task_id in self.by_tag.get(tag, {})]
+
+    def due_on(self, day):
+        return [self.tasks[task_id] for task_id in self.by_due.get(day, {})]
+
+    def search(self, query, limit=None):
+        """Tasks matching a query like "milk OR bread", "rep*" or "work -meeting"."""
+        return [self.tasks[task_id] for task_id in self.words.search(query, limit)]
+
+    def close(self):
+        self.log.close()
@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+
+# Scripts and bulk runs can switch every pause off:
+#   NO_DELAY=1 python Membership.py    or    python Membership.py --no-delay
+# Pauses are also skipped when input is piped in instead of typed.
+NO_DELAY = os.environ.get("NO_DELAY") == "1" or "--no-delay" in sys.argv
+
+
+def _wait_for_key(timeout):
+    """Wait until Enter is pressed or `timeout` seconds pass, whichever comes first."""
+    if os.name == "nt":
+        import msvcrt
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            if msvcrt.kbhit():
+                msvcrt.getwch()
+                return
+            time.sleep(0.05)
+    else:
+        import select
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+        if ready:
+            # Eat the line so it doesn't answer the next input() prompt
+            sys.stdin.readline()
+
+
+def pause(timeout=2):
+    """Give the user up to `timeout` seconds to read the screen; Enter skips the wait."""
+    if NO_DELAY or timeout <= 0 or not sys.stdin.isatty():
+        return
+    _wait_for_key(timeout)
+
+
+def notify(message, timeout=2):
+    """Show a status message, then pause() so it stays visible before the screen clears."""
+    print(message)
+    pause(timeout)
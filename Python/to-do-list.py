@@ -1,6 +1,8 @@
 import os
-import time
-import json
+from datetime import date
+from term_ui import notify, pause
+from task_store import TaskStore
+from task_schedule import TaskScheduler, PRIORITIES, DEFAULT_PRIORITY, REPEATS
 
 def clear():
     """مسح الشاشة حسب نظام التشغيل"""
@@ -9,80 +11,147 @@ def clear():
     else:
         os.system("clear")
 
-def load_tasks(file_path):
-    """تحميل المهام من ملف JSON"""
-    if os.path.exists(file_path):
-        with open(file_path, 'r') as file:
-            return json.load(file)
-    return []
-
-def save_tasks(file_path, tasks):
-    """حفظ المهام في ملف JSON"""
-    with open(file_path, 'w') as file:
-        json.dump(tasks, file, indent=4)
-
 print("             Welcome To The Build To-Do List Application with Python             \n")
 
 Message = """
 1 - Add tasks to a list
 2 - Mark task as complete
 3 - View tasks
-4 - Quit 
+4 - Agenda (next, overdue, due this week)
+5 - Search tasks
+6 - Edit a task
+7 - Quit 
 """
 
-Tasks = load_tasks("tasks.json")
+Tasks = TaskStore("tasks.json")
+Schedule = TaskScheduler(Tasks)
 
 def Add_Task():
    
-    time.sleep(2)
     clear()
     Task = input("Enter task: ")
-    Task_info = {"Task": Task, "Complete": False}
-    Tasks.append(Task_info)
+    Notes = input("Notes (Enter for none): ").strip()
+    Tags = [tag.strip() for tag in input("Tags, comma separated (Enter for none): ").split(",") if tag.strip()]
+    Due = input("Due date YYYY-MM-DD (Enter for none): ").strip() or None
+    if Due:
+        try:
+            date.fromisoformat(Due)
+        except ValueError:
+            notify("Invalid date, please use YYYY-MM-DD.")
+            return
+    Priority = input("Priority high/medium/low (Enter for medium): ").strip().lower() or DEFAULT_PRIORITY
+    if Priority not in PRIORITIES:
+        notify("Invalid priority.")
+        return
+    Repeat = None
+    if Due:
+        Repeat = input("Repeat daily/weekly/monthly (Enter for never): ").strip().lower() or None
+        if Repeat and Repeat not in REPEATS:
+            notify("Invalid repeat.")
+            return
+    Task_info = Tasks.add(Task, Tags, Due, Priority, Repeat, Notes)
+    Schedule.schedule(Task_info)
     
-    print("Task added to the list successfully.")
-    time.sleep(2)
-    save_tasks("tasks.json", Tasks)
+    notify(f"Task #{Task_info['id']} added to the list successfully.")
 
 def Mark_Task():
     
-    time.sleep(2)
     clear()
-    if not Tasks:
-        print("No tasks to mark as complete.")
+    Incomplete = Tasks.incomplete_tasks()
+    if not Incomplete:
+        notify("No tasks to mark as complete.")
         return
     
-    View_Tasks()
+    print("Tasks List:")
+    Show_Tasks(Incomplete)
     try:
-        time.sleep(1)
-        task_index = int(input("Enter the number of the task to mark as complete: ")) - 1
-        if 0 <= task_index < len(Tasks):
-            Tasks[task_index]["Complete"] = True
-            time.sleep(1)
-            print("Task marked as complete.")
-            time.sleep(2)
-            save_tasks("tasks.json", Tasks)
+        task_id = int(input("Enter the ID of the task to mark as complete: "))
+        if Tasks.complete(task_id):
+            # مهمة متكررة تنتقل لموعدها القادم بدل ما تكتمل
+            Schedule.schedule(Tasks.get(task_id))
+            notify("Task marked as complete.")
         else:
-            time.sleep(2)
-            print("Invalid task number.")
+            notify("Invalid task ID.")
     except ValueError:
-        print("Please enter a valid number.")
-        time.sleep(2)
+        notify("Please enter a valid number.")
 
 def View_Tasks():
     
-    time.sleep(2)
     clear()
     if not Tasks:
         print("No tasks in the list.")
         return
-    time.sleep(1)
     print("Tasks List:")
-    for index, task in enumerate(Tasks, start=1):
+    Show_Tasks(Tasks)
+
+def Search_Tasks():
+    """البحث في عناوين المهام وملاحظاتها"""
+    clear()
+    print('Search words, "rep*" for prefixes, OR between alternatives, -word to exclude.')
+    Query = input("Search: ").strip()
+    if not Query:
+        return
+    Found = Tasks.search(Query)
+    if not Found:
+        print("No matching tasks.")
+        return
+    print(f"{len(Found)} matching tasks:")
+    Show_Tasks(Found)
+
+def Edit_Task():
+    
+    clear()
+    try:
+        task_id = int(input("Enter the ID of the task to edit: "))
+    except ValueError:
+        notify("Please enter a valid number.")
+        return
+    task = Tasks.get(task_id)
+    if task is None:
+        notify("Invalid task ID.")
+        return
+    Title = input(f"New title (Enter to keep '{task['Task']}'): ").strip() or None
+    Notes = input("New notes (Enter to keep, '-' to clear): ").strip() or None
+    if Notes == "-":
+        Notes = ""
+    Tasks.edit(task_id, Title, Notes)
+    notify("Task updated.")
+
+def View_Agenda():
+    """عرض المهمة التالية والمتأخرة والمطلوبة هذا الأسبوع"""
+    clear()
+    Next = Schedule.next_task()
+    if Next is None:
+        print("Nothing left to do.")
+        return
+    print("Next up:")
+    Show_Tasks([Next])
+    Overdue = Schedule.overdue()
+    if Overdue:
+        print("Overdue:")
+        Show_Tasks(Overdue)
+    This_Week = Schedule.due_within(7)
+    if This_Week:
+        print("Due this week:")
+        Show_Tasks(This_Week)
+
+def Show_Tasks(tasks):
+    """عرض المهام برقمها الثابت مع الوسوم وتاريخ التسليم"""
+    for task in tasks:
         status = "Complete" if task["Complete"] else "Incomplete"
-        print(f"{index}. {task['Task']} - {status}")
+        extra = ""
+        if task["Tags"]:
+            extra += f" [{', '.join(task['Tags'])}]"
+        if task["Due"]:
+            extra += f" (due {task['Due']})"
+        if task["Repeat"]:
+            extra += f" repeats {task['Repeat']}"
+        if task["Priority"] != DEFAULT_PRIORITY:
+            extra += f" !{task['Priority']}"
+        print(f"#{task['id']}. {task['Task']} - {status}{extra}")
+        if task["Notes"]:
+            print(f"      {task['Notes']}")
     print() 
-    time.sleep(4)
     
 
 while True:
@@ -95,11 +164,18 @@ while True:
         Mark_Task()
     elif Choice == "3":
         View_Tasks()
-        time.sleep(2)
+        pause(6)
     elif Choice == "4":
+        View_Agenda()
+        pause(6)
+    elif Choice == "5":
+        Search_Tasks()
+        pause(6)
+    elif Choice == "6":
+        Edit_Task()
+    elif Choice == "7":
         print("Exiting the application.")
-        save_tasks("tasks.json", Tasks)
+        Tasks.close()
         break
     else:
-        print("Invalid choice, Please enter a number between 1 and 4.")
-        time.sleep(2)
+        notify("Invalid choice, Please enter a number between 1 and 7.")
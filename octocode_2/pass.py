@@ -1,10 +1,10 @@
 
-import random
+import secrets
 import string
 
 def generate_password(length=18):
     characters = string.ascii_letters + string.digits + string.punctuation
-    password = ''.join(random.choice(characters) for _ in range(length))
+    password = ''.join(secrets.choice(characters) for _ in range(length))
     return password
 
 while True: